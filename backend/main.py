@@ -1,9 +1,12 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import chromadb
+import httpx
+import numpy as np
 import openai
 import os
+import asyncio
 import uuid
 import datetime
 from typing import List, Optional
@@ -28,8 +31,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize OpenAI client
-openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Initialize OpenAI client with a shared keep-alive connection pool
+openai_http_client = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+)
+openai_client = openai.OpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=openai_http_client
+)
 
 # Initialize ChromaDB (connect to containerized service)
 chromadb_host = os.getenv("CHROMADB_HOST", "localhost")
@@ -60,6 +70,15 @@ def ensure_bucket_exists():
 # Ensure bucket exists on startup
 ensure_bucket_exists()
 
+def read_minio_object(object_name: str) -> bytes:
+    """Read an object from MinIO fully and release the connection"""
+    response = minio_client.get_object(bucket_name, object_name)
+    try:
+        return response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
 # Sample knowledge base documents
 kb_documents = [
     {"id": "1", "text": "Wave picking is a warehouse management method where multiple orders are grouped into batches and picked simultaneously by warehouse workers, improving efficiency and reducing travel time."},
@@ -90,7 +109,7 @@ def initialize_knowledge_base():
                     model="text-embedding-ada-002",
                     input=doc["text"]
                 )
-                embedding = embedding_response.data[0].embedding
+                embedding = np.asarray(embedding_response.data[0].embedding, dtype=np.float32)
                 
                 # Add to ChromaDB
                 collection.add(
@@ -112,6 +131,30 @@ class ChatMessage(BaseModel):
 class ChatResponse(BaseModel):
     response: str
 
+class DocumentSummary(BaseModel):
+    id: str
+    filename: str
+    minio_filename: str
+    content_type: str
+    upload_time: str
+    size: int
+    text_size: int
+    word_count: int
+    title: str
+    category: str
+    document_type: str
+    topics: List[str]
+    summary: str
+    chunks: int
+    preview: str
+    has_minio_file: bool
+
+class DocumentListResponse(BaseModel):
+    documents: List[DocumentSummary]
+    total: int
+    page: int
+    per_page: Optional[int]
+
 def search_knowledge_base(query: str, n_results: int = 3) -> List[str]:
     """Search knowledge base for relevant documents"""
     try:
@@ -120,7 +163,7 @@ def search_knowledge_base(query: str, n_results: int = 3) -> List[str]:
             model="text-embedding-ada-002",
             input=query
         )
-        query_embedding = embedding_response.data[0].embedding
+        query_embedding = np.asarray(embedding_response.data[0].embedding, dtype=np.float32)
         
         # Search ChromaDB
         results = collection.query(
@@ -202,18 +245,12 @@ def extract_text_from_file(file: UploadFile) -> str:
         elif file.content_type == "application/pdf":
             pdf_file = io.BytesIO(content)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            return "".join(page.extract_text() + "\n" for page in pdf_reader.pages)
         
         elif file.content_type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document"]:
             doc_file = io.BytesIO(content)
             doc = docx.Document(doc_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
         
         else:
             # Try to decode as text for other formats
@@ -224,6 +261,15 @@ def extract_text_from_file(file: UploadFile) -> str:
     finally:
         file.file.seek(0)  # Reset file pointer
 
+def has_min_content(text: str, min_length: int = 10) -> bool:
+    """Check that text has at least min_length characters once surrounding whitespace is ignored"""
+    # Walk in from both ends instead of strip() so large texts aren't copied
+    start = next((i for i, c in enumerate(text) if not c.isspace()), None)
+    if start is None:
+        return False
+    end = next(i for i in range(len(text) - 1, start - 1, -1) if not text[i].isspace())
+    return end - start + 1 >= min_length
+
 def analyze_document_content(text: str, filename: str) -> dict:
     """Analyze document content to extract metadata and categorize"""
     try:
@@ -303,6 +349,24 @@ def chunk_document(text: str, chunk_size: int = 1000, overlap: int = 200) -> Lis
     
     return chunks
 
+def embed_chunks(chunks: List[str], batch_size: int = 64) -> List[np.ndarray]:
+    """Create embeddings for chunks in batches, grouping chunks of similar length"""
+    # Batches are as slow as their longest input, so embed in length order
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+    embeddings = [None] * len(chunks)
+    
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        embedding_response = openai_client.embeddings.create(
+            model="text-embedding-ada-002",
+            input=[chunks[i] for i in batch]
+        )
+        for item in embedding_response.data:
+            # Keep the vector as packed float32 rather than a list of boxed floats
+            embeddings[batch[item.index]] = np.asarray(item.embedding, dtype=np.float32)
+    
+    return embeddings
+
 @app.post("/upload")
 async def upload_document(file: UploadFile = File(...)):
     """Upload and process a document into the knowledge base"""
@@ -335,7 +399,8 @@ async def upload_document(file: UploadFile = File(...)):
         
         # Upload to MinIO
         try:
-            minio_client.put_object(
+            await asyncio.to_thread(
+                minio_client.put_object,
                 bucket_name,
                 minio_filename,
                 io.BytesIO(file_content),
@@ -350,7 +415,7 @@ async def upload_document(file: UploadFile = File(...)):
         file.file = io.BytesIO(file_content)
         text_content = extract_text_from_file(file)
         
-        if len(text_content.strip()) < 10:
+        if not has_min_content(text_content):
             raise HTTPException(status_code=400, detail="File content is too short or empty")
         
         # Analyze document content using AI
@@ -359,20 +424,19 @@ async def upload_document(file: UploadFile = File(...)):
         # Split document into chunks for better retrieval
         chunks = chunk_document(text_content)
         
+        # Count words once at ingest so listings and stats never re-split text
+        word_count = len(text_content.split())
+        
+        # Create embeddings for all chunks up front
+        embeddings = await asyncio.to_thread(embed_chunks, chunks)
+        
         # Process each chunk separately
         chunk_ids = []
-        for i, chunk in enumerate(chunks):
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
             # Generate unique ID for each chunk
             chunk_id = f"{doc_id}_chunk_{i}"
             chunk_ids.append(chunk_id)
             
-            # Create embedding for this chunk
-            embedding_response = openai_client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=chunk
-            )
-            embedding = embedding_response.data[0].embedding
-            
             # Enhanced metadata with AI analysis and MinIO reference
             metadata = {
                 "document_id": doc_id,
@@ -382,6 +446,7 @@ async def upload_document(file: UploadFile = File(...)):
                 "upload_time": upload_time,
                 "size": file_size,
                 "text_size": len(text_content),
+                "word_count": word_count,
                 "chunk_index": i,
                 "total_chunks": len(chunks),
                 "title": doc_analysis.get("title", file.filename),
@@ -392,7 +457,8 @@ async def upload_document(file: UploadFile = File(...)):
             }
             
             # Store chunk in ChromaDB
-            collection.add(
+            await asyncio.to_thread(
+                collection.add,
                 ids=[chunk_id],
                 documents=[chunk],
                 embeddings=[embedding],
@@ -417,22 +483,29 @@ async def upload_document(file: UploadFile = File(...)):
         print(f"Error uploading document: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
 
-@app.get("/documents")
-async def list_documents():
-    """List all documents in the knowledge base"""
+@app.get("/documents", response_model=DocumentListResponse)
+async def list_documents(
+    search: Optional[str] = Query(None, description="Only include documents containing this text"),
+    page: int = Query(1, ge=1),
+    per_page: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit to return every document")
+):
+    """List documents in the knowledge base, optionally filtered and paginated"""
     try:
-        results = collection.get(include=["metadatas", "documents"])
+        # Filtering happens in Chroma; chunk text is only fetched for the returned page
+        get_args = {"include": ["metadatas"]}
+        if search:
+            get_args["where_document"] = {"$contains": search}
+        results = await asyncio.to_thread(collection.get, **get_args)
         
         # Group chunks by document_id to show as single documents
         document_groups = {}
+        preview_chunk_ids = {}
         for i, doc_id in enumerate(results["ids"]):
             # Handle cases where metadatas might be None or contain None values
             metadata = {}
             if results["metadatas"] and i < len(results["metadatas"]) and results["metadatas"][i]:
                 metadata = results["metadatas"][i]
             
-            content = results["documents"][i] if results["documents"] and i < len(results["documents"]) else ""
-            
             # Use document_id for grouping, fallback to filename or doc_id
             document_id = metadata.get("document_id")
             if not document_id:
@@ -449,6 +522,7 @@ async def list_documents():
                     "upload_time": metadata.get("upload_time", ""),
                     "size": metadata.get("size", 0),
                     "text_size": metadata.get("text_size", 0),
+                    "word_count": metadata.get("word_count", 0),
                     "title": metadata.get("title", filename),
                     "category": metadata.get("category", "Document"),
                     "document_type": metadata.get("document_type", "Unknown"),
@@ -458,42 +532,82 @@ async def list_documents():
                     "preview": "",
                     "has_minio_file": bool(metadata.get("minio_filename"))
                 }
+                preview_chunk_ids[document_id] = doc_id
             
-            # Update chunk count and preview
+            # Update chunk count
             document_groups[document_id]["chunks"] += 1
-            if not document_groups[document_id]["preview"]:
-                document_groups[document_id]["preview"] = content[:200] + "..." if len(content) > 200 else content
         
         documents = list(document_groups.values())
-        return {"documents": documents, "total": len(documents)}
+        total = len(documents)
+        if per_page:
+            start = (page - 1) * per_page
+            documents = documents[start:start + per_page]
+        
+        # Fill in previews for the returned documents only
+        if documents:
+            chunk_ids = [preview_chunk_ids[doc["id"]] for doc in documents]
+            previews = await asyncio.to_thread(collection.get, ids=chunk_ids, include=["documents"])
+            content_by_id = dict(zip(previews["ids"], previews["documents"] or []))
+            for doc, chunk_id in zip(documents, chunk_ids):
+                content = content_by_id.get(chunk_id) or ""
+                doc["preview"] = content[:200] + "..." if len(content) > 200 else content
+        
+        return {"documents": documents, "total": total, "page": page, "per_page": per_page}
     
     except Exception as e:
         print(f"Error listing documents: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving documents")
 
-@app.get("/download/{doc_id}")
-async def download_document(doc_id: str):
-    """Download original document file from MinIO"""
+@app.get("/stats")
+async def document_stats():
+    """Aggregate counters for the knowledge base without shipping document content"""
     try:
-        # Find document chunks to get MinIO filename
-        results = collection.get(include=["metadatas"])
-        minio_filename = None
+        results = await asyncio.to_thread(collection.get, include=["metadatas"])
         
+        # Keep the first chunk's metadata for each document
+        document_metadata = {}
         for i, chunk_id in enumerate(results["ids"]):
+            metadata = {}
             if results["metadatas"] and i < len(results["metadatas"]) and results["metadatas"][i]:
                 metadata = results["metadatas"][i]
-                if metadata.get("document_id") == doc_id or chunk_id.startswith(doc_id):
-                    minio_filename = metadata.get("minio_filename")
-                    break
+            
+            document_id = metadata.get("document_id")
+            if not document_id:
+                document_id = chunk_id.split('_chunk_')[0] if '_chunk_' in chunk_id else chunk_id
+            
+            document_metadata.setdefault(document_id, metadata)
+        
+        return {
+            "total": len(document_metadata),
+            "with_metadata": sum(1 for metadata in document_metadata.values() if metadata),
+            "total_words": sum(metadata.get("word_count", 0) for metadata in document_metadata.values())
+        }
+    
+    except Exception as e:
+        print(f"Error computing stats: {e}")
+        raise HTTPException(status_code=500, detail="Error retrieving stats")
+
+@app.get("/download/{doc_id}")
+async def download_document(doc_id: str):
+    """Download original document file from MinIO"""
+    try:
+        # Every uploaded chunk carries its document_id, so let Chroma do the lookup
+        results = await asyncio.to_thread(
+            collection.get,
+            where={"document_id": doc_id},
+            limit=1,
+            include=["metadatas"]
+        )
+        minio_filename = None
+        if results["metadatas"] and results["metadatas"][0]:
+            minio_filename = results["metadatas"][0].get("minio_filename")
         
         if not minio_filename:
             raise HTTPException(status_code=404, detail="Document not found or no original file available")
         
         # Get file from MinIO
         try:
-            response = minio_client.get_object(bucket_name, minio_filename)
-            file_data = response.read()
-            response.close()
+            file_data = await asyncio.to_thread(read_minio_object, minio_filename)
             
             # Extract original filename from minio_filename (remove UUID prefix)
             original_filename = minio_filename.split('_', 1)[1] if '_' in minio_filename else minio_filename
@@ -522,28 +636,29 @@ async def delete_document(doc_id: str):
     """Delete a document from the knowledge base"""
     try:
         # Find all chunks for this document and get MinIO filename
-        results = collection.get(include=["metadatas"])
-        chunks_to_delete = []
+        results = await asyncio.to_thread(
+            collection.get,
+            where={"document_id": doc_id},
+            include=["metadatas"]
+        )
+        chunks_to_delete = results["ids"]
         minio_filename = None
         
-        for i, chunk_id in enumerate(results["ids"]):
-            if results["metadatas"] and i < len(results["metadatas"]) and results["metadatas"][i]:
-                metadata = results["metadatas"][i]
-                if metadata.get("document_id") == doc_id or chunk_id.startswith(doc_id):
-                    chunks_to_delete.append(chunk_id)
-                    if not minio_filename:
-                        minio_filename = metadata.get("minio_filename")
+        for metadata in results["metadatas"] or []:
+            if metadata and metadata.get("minio_filename"):
+                minio_filename = metadata["minio_filename"]
+                break
         
         if not chunks_to_delete:
             raise HTTPException(status_code=404, detail="Document not found")
         
         # Delete from ChromaDB
-        collection.delete(ids=chunks_to_delete)
+        await asyncio.to_thread(collection.delete, ids=chunks_to_delete)
         
         # Delete from MinIO if file exists
         if minio_filename:
             try:
-                minio_client.remove_object(bucket_name, minio_filename)
+                await asyncio.to_thread(minio_client.remove_object, bucket_name, minio_filename)
                 print(f"Deleted {minio_filename} from MinIO")
             except S3Error as e:
                 print(f"Warning: Could not delete file from MinIO: {e}")
@@ -1,37 +1,160 @@
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse
-import requests
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from bisect import bisect_right
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+import httpx
+import orjson
 import uvicorn
+from cachetools import LRUCache, TTLCache
 from typing import Optional
+import asyncio
+import hashlib
 import os
 
-app = FastAPI(title="ChromaDB Document Viewer", version="2.0.0")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
 
 # Backend API URL - use container network
 BACKEND_URL = os.getenv("BACKEND_URL", "http://backend:8002")
 
-def get_documents_from_backend():
-    """Get all documents from backend API"""
-    try:
-        response = requests.get(f"{BACKEND_URL}/documents", timeout=10)
+# Shared keep-alive connection pool to the backend
+backend_client = httpx.AsyncClient(
+    base_url=BACKEND_URL,
+    timeout=10,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await backend_client.aclose()
+
+app = FastAPI(
+    title="ChromaDB Document Viewer",
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# HTML and CSS compress very well; compress anything worth the overhead
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+class CachedStaticFiles(StaticFiles):
+    """Static files served with far-future caching; URLs are versioned by content hash"""
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
         if response.status_code == 200:
-            data = response.json()
-            return data.get('documents', []), data.get('total', 0)
-        else:
-            print(f"Backend API error: {response.status_code} - {response.text}")
-            return [], 0
-    except Exception as e:
-        print(f"Error connecting to backend: {e}")
-        return [], 0
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+
+@lru_cache(maxsize=None)
+def static_url(filename: str) -> str:
+    """URL for a static asset with a content hash so deploys bust browser caches"""
+    with open(os.path.join(STATIC_DIR, filename), "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    return f"/static/{filename}?v={digest}"
+
+# Page templates, compiled once and kept in a bytecode cache across restarts
+templates = Environment(
+    loader=FileSystemLoader(os.path.join(BASE_DIR, "templates")),
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=FileSystemBytecodeCache()
+)
+templates.filters["thousands"] = lambda value: f"{value:,}"
+templates.globals["static_url"] = static_url
+
+# Relevance badge (color, label) for a similarity score, bucketed at 30/50/70
+RELEVANCE_THRESHOLDS = (30, 50, 70)
+RELEVANCE_STYLES = (
+    ("#8b5cf6", "Vector proximity"),
+    ("#f59e0b", "Low relevance"),
+    ("#3b82f6", "Moderate relevance"),
+    ("#22c55e", "High relevance")
+)
+
+# Rendered home pages keyed by ETag; the page only depends on the stats
+_home_pages = LRUCache(maxsize=8)
+
+# Short-lived cache of backend responses so bursts of page views share one fetch
+_docs_cache = TTLCache(maxsize=64, ttl=int(os.getenv("DOCUMENTS_CACHE_TTL", "30")))
+
+# Backend fetches currently in flight, so concurrent cache misses share one call
+_inflight = {}
+
+async def coalesce(key, fetch):
+    """Run fetch() once per key at a time and hand its result to every concurrent caller"""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one disconnecting client doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+async def get_documents_from_backend(search: Optional[str] = None, page: int = 1, per_page: Optional[int] = None):
+    """Get documents from backend API, filtered and paginated by the backend; None if the backend failed"""
+    cache_key = ("documents", search, page, per_page)
+    cached = _docs_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    params = {"page": page}
+    if search:
+        params["search"] = search
+    if per_page:
+        params["per_page"] = per_page
+    
+    async def fetch():
+        try:
+            response = await backend_client.get("/documents", params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                result = data.get('documents', []), data.get('total', 0)
+                _docs_cache[cache_key] = result
+                return result
+            else:
+                print(f"Backend API error: {response.status_code} - {response.text}")
+                return None
+        except Exception as e:
+            print(f"Error connecting to backend: {e}")
+            return None
+    
+    return await coalesce(cache_key, fetch)
+
+async def get_stats_from_backend() -> Optional[dict]:
+    """Get aggregate document counters from backend API; None if the backend failed"""
+    cached = _docs_cache.get("stats")
+    if cached is not None:
+        return cached
+    
+    async def fetch():
+        try:
+            response = await backend_client.get("/stats")
+            if response.status_code == 200:
+                stats = orjson.loads(response.content)
+                _docs_cache["stats"] = stats
+                return stats
+            else:
+                print(f"Backend API error: {response.status_code} - {response.text}")
+                return None
+        except Exception as e:
+            print(f"Error connecting to backend: {e}")
+            return None
+    
+    return await coalesce("stats", fetch)
 
-def semantic_search_backend(query: str, limit: int = 10):
-    """Perform semantic search using backend API"""
+async def semantic_search_backend(query: str, limit: int = 10):
+    """Perform semantic search using backend API; None if the backend failed"""
     try:
-        response = requests.post(f"{BACKEND_URL}/search", 
-                                json={"query": query, "n_results": limit}, 
-                                timeout=10)
+        response = await backend_client.post("/search", json={"query": query, "n_results": limit})
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             # Convert backend format to viewer format
             results = []
             for i, result in enumerate(data.get('results', [])):
@@ -48,10 +171,10 @@ def semantic_search_backend(query: str, limit: int = 10):
             return results, data.get('total_found', 0)
         else:
             print(f"Search API error: {response.status_code} - {response.text}")
-            return [], 0
+            return None
     except Exception as e:
         print(f"Error in semantic search: {e}")
-        return [], 0
+        return None
 
 # Semantic search is now handled by the backend using OpenAI embeddings
 
@@ -60,624 +183,119 @@ async def health():
     """Health check endpoint"""
     return {"status": "healthy", "service": "chromadb-viewer"}
 
+@app.post("/cache/invalidate")
+async def invalidate_cache():
+    """Drop cached backend data so the next request refetches it"""
+    # Best effort: each worker process has its own cache and this clears only the
+    # worker that receives the request; the others refetch when their TTL expires
+    _docs_cache.clear()
+    return {"status": "invalidated", "worker_pid": os.getpid()}
+
 @app.get("/", response_class=HTMLResponse)
-async def home():
+async def home(request: Request):
     """Clean and focused ChromaDB viewer homepage"""
     # Get essential stats only
-    documents, total_count = get_documents_from_backend()
+    stats = await get_stats_from_backend()
     
-    return HTMLResponse(f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>ChromaDB Viewer</title>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; 
-                background: #f8fafc;
-                min-height: 100vh;
-                color: #1e293b;
-            }}
-            
-            .container {{
-                max-width: 900px;
-                margin: 0 auto;
-                padding: 2rem 1rem;
-            }}
-            
-            .header {{
-                text-align: center;
-                margin-bottom: 3rem;
-                padding: 2rem 0;
-            }}
-            
-            .title {{
-                font-size: 2.5rem;
-                font-weight: 800;
-                color: #1e40af;
-                margin-bottom: 0.5rem;
-            }}
-            
-            .subtitle {{
-                font-size: 1.1rem;
-                color: #64748b;
-                max-width: 500px;
-                margin: 0 auto;
-                line-height: 1.6;
-            }}
-            
-            .search-section {{
-                background: white;
-                border-radius: 16px;
-                padding: 2rem;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                margin-bottom: 3rem;
-                border: 1px solid #e2e8f0;
-            }}
-            
-            .search-form {{
-                display: flex;
-                gap: 1rem;
-                margin-bottom: 1rem;
-            }}
-            
-            .search-input {{
-                flex: 1;
-                padding: 0.875rem 1rem;
-                border: 1px solid #d1d5db;
-                border-radius: 8px;
-                font-size: 1rem;
-                transition: all 0.2s;
-            }}
-            
-            .search-input:focus {{
-                outline: none;
-                border-color: #1e40af;
-                box-shadow: 0 0 0 3px rgba(30, 64, 175, 0.1);
-            }}
-            
-            .search-btn {{
-                background: #1e40af;
-                color: white;
-                border: none;
-                padding: 0.875rem 1.5rem;
-                border-radius: 8px;
-                font-weight: 500;
-                cursor: pointer;
-                transition: all 0.2s;
-            }}
-            
-            .search-btn:hover {{
-                background: #1d4ed8;
-                transform: translateY(-1px);
-            }}
-            
-            .search-hint {{
-                color: #64748b;
-                font-size: 0.875rem;
-                text-align: center;
-            }}
-            
-            .stats {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
-                gap: 1rem;
-                margin-bottom: 2rem;
-            }}
-            
-            .stat {{
-                background: white;
-                border-radius: 12px;
-                padding: 1.5rem 1rem;
-                text-align: center;
-                border: 1px solid #e2e8f0;
-                transition: all 0.2s;
-            }}
-            
-            .stat:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-            }}
-            
-            .stat-number {{
-                font-size: 1.75rem;
-                font-weight: 700;
-                color: #1e40af;
-                display: block;
-                margin-bottom: 0.25rem;
-            }}
-            
-            .stat-label {{
-                font-size: 0.75rem;
-                color: #64748b;
-                text-transform: uppercase;
-                font-weight: 500;
-                letter-spacing: 0.05em;
-            }}
-            
-            .actions {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 1rem;
-            }}
-            
-            .action-btn {{
-                background: white;
-                border: 2px solid #e2e8f0;
-                border-radius: 12px;
-                padding: 1.5rem;
-                text-decoration: none;
-                color: inherit;
-                transition: all 0.2s;
-                display: flex;
-                align-items: center;
-                gap: 1rem;
-            }}
-            
-            .action-btn:hover {{
-                border-color: #1e40af;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-            }}
-            
-            .action-icon {{
-                font-size: 1.5rem;
-                flex-shrink: 0;
-            }}
-            
-            .action-text {{
-                flex: 1;
-            }}
-            
-            .action-title {{
-                font-weight: 600;
-                margin-bottom: 0.25rem;
-                color: #1e293b;
-            }}
-            
-            .action-desc {{
-                font-size: 0.875rem;
-                color: #64748b;
-            }}
-            
-            @media (max-width: 640px) {{
-                .search-form {{
-                    flex-direction: column;
-                }}
-                .stats {{
-                    grid-template-columns: repeat(2, 1fr);
-                }}
-                .actions {{
-                    grid-template-columns: 1fr;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1 class="title">ChromaDB Viewer</h1>
-                <p class="subtitle">AI-powered document search and exploration with semantic understanding</p>
-            </div>
-            
-            <div class="search-section">
-                <form class="search-form" action="/documents" method="get">
-                    <input type="text" name="search" class="search-input" 
-                           placeholder="Search documents with AI semantic understanding..." 
-                           autofocus>
-                    <button type="submit" class="search-btn">🔍 Search</button>
-                </form>
-                <p class="search-hint">Ask questions or describe what you're looking for - powered by OpenAI embeddings</p>
-            </div>
-            
-            <div class="stats">
-                <div class="stat">
-                    <span class="stat-number">{total_count}</span>
-                    <div class="stat-label">Documents</div>
-                </div>
-                <div class="stat">
-                    <span class="stat-number">{sum(doc.get('word_count', 0) for doc in documents):,}</span>
-                    <div class="stat-label">Words</div>
-                </div>
-                <div class="stat">
-                    <span class="stat-number">1536</span>
-                    <div class="stat-label">Dimensions</div>
-                </div>
-                <div class="stat">
-                    <span class="stat-number">AI</span>
-                    <div class="stat-label">Powered</div>
-                </div>
-            </div>
-            
-            <div class="actions">
-                <a href="/documents" class="action-btn">
-                    <div class="action-icon">📄</div>
-                    <div class="action-text">
-                        <div class="action-title">Browse All Documents</div>
-                        <div class="action-desc">View and explore your document collection</div>
-                    </div>
-                </a>
-                <a href="#" class="action-btn" onclick="const query = prompt('What are you looking for?'); if(query) {{ window.location.href = '/documents?search=' + encodeURIComponent(query); }} return false;">
-                    <div class="action-icon">🧠</div>
-                    <div class="action-text">
-                        <div class="action-title">Semantic Search</div>
-                        <div class="action-desc">Find documents by meaning, not just keywords</div>
-                    </div>
-                </a>
-            </div>
-        </div>
-    </body>
-    </html>
-    """)
+    # Zeros from an unreachable backend are rendered but never cached
+    if stats is None:
+        return HTMLResponse(
+            templates.get_template("home.html").render(total_count=0, total_words=0),
+            headers={"Cache-Control": "no-store"}
+        )
+    
+    total_count = stats.get('total', 0)
+    total_words = stats.get('total_words', 0)
+    
+    # The page is a pure function of the stats (and stylesheet version)
+    fingerprint = f"{total_count}:{total_words}:{static_url('home.css')}"
+    etag = '"' + hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60", "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    body = _home_pages.get(etag)
+    if body is None:
+        body = templates.get_template("home.html").render(total_count=total_count, total_words=total_words)
+        _home_pages[etag] = body
+    return HTMLResponse(body, headers=headers)
 
 @app.get("/documents", response_class=HTMLResponse)
-async def documents_page(search: str = Query("", description="Search term"), page: int = Query(1, ge=1)):
-    """Clean documents page with semantic search"""
+async def documents_page():
+    """Documents page shell; the browser loads the cards from /api/documents"""
+    return HTMLResponse(
+        render_documents_shell(),
+        headers={"Cache-Control": "public, max-age=300", "Vary": "Accept-Encoding"}
+    )
+
+@lru_cache(maxsize=1)
+def render_documents_shell() -> str:
+    """The documents page markup never varies per request, so render it once"""
+    return templates.get_template("documents.html").render()
+
+@app.get("/api/documents")
+async def documents_api(search: str = Query("", description="Search term"), page: int = Query(1, ge=1)):
+    """One page of document cards, with semantic search"""
     try:
-        # Use semantic search if query provided, otherwise get all documents
-        if search.strip():
-            documents, total_count = semantic_search_backend(search, limit=50)
-            if not documents:
-                documents, total_count = get_documents_from_backend()
-        else:
-            documents, total_count = get_documents_from_backend()
-        
-        if not documents:
-            return HTMLResponse("""
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>No Documents Found</title>
-                <style>
-                    body {{ 
-                        font-family: system-ui; 
-                        background: #f8fafc; 
-                        min-height: 100vh; 
-                        display: flex; 
-                        align-items: center; 
-                        justify-content: center; 
-                        margin: 0; 
-                    }}
-                    .error-container {{
-                        background: white;
-                        padding: 3rem;
-                        border-radius: 12px;
-                        text-align: center;
-                        max-width: 400px;
-                        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-                    }}
-                    .error-icon {{ font-size: 3rem; margin-bottom: 1rem; }}
-                    .error-title {{ font-size: 1.5rem; font-weight: 600; margin-bottom: 1rem; }}
-                    .error-desc {{ color: #64748b; margin-bottom: 2rem; }}
-                    .btn {{ 
-                        background: #1e40af; 
-                        color: white; 
-                        padding: 0.75rem 1.5rem; 
-                        border-radius: 8px; 
-                        text-decoration: none; 
-                        margin: 0 0.5rem; 
-                        display: inline-block;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="error-container">
-                    <div class="error-icon">📄</div>
-                    <h2 class="error-title">No Documents Found</h2>
-                    <p class="error-desc">Unable to connect to the backend or no documents available.</p>
-                    <a href="/" class="btn">← Back to Home</a>
-                </div>
-            </body>
-            </html>
-            """)
-        
-        # Pagination
         per_page = 12
-        total_pages = max(1, (len(documents) + per_page - 1) // per_page)
         start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_docs = documents[start_idx:end_idx]
         
-        # Create document cards
-        cards_html = ""
+        # Semantic search returns a small ranked set that is paged here;
+        # browsing and text matching are filtered and paged by the backend
+        results = await semantic_search_backend(search, limit=50) if search.strip() else None
+        if results and results[0]:
+            documents, total_count = results
+            result_count = len(documents)
+            paginated_docs = documents[start_idx:start_idx + per_page]
+            backend_ok = True
+        else:
+            if search.strip():
+                listing = await get_documents_from_backend(search, page, per_page)
+            else:
+                listing = await get_documents_from_backend(page=page, per_page=per_page)
+            # An unreachable backend yields an empty page that must not be cached
+            backend_ok = listing is not None
+            paginated_docs, total_count = listing or ([], 0)
+            result_count = total_count
+        
+        total_pages = max(1, (result_count + per_page - 1) // per_page)
+        
+        # Prepare document cards
+        cards = []
         for i, doc in enumerate(paginated_docs):
             doc_number = start_idx + i + 1
-            doc_id = doc.get('id', f'doc_{doc_number}')
             doc_content = doc.get('preview', '') or doc.get('content', '')
-            word_count = doc.get('word_count', len(doc_content.split()) if doc_content else 0)
-            title = doc.get('title', f'Document {doc_number}')
-            category = doc.get('category', 'Document')
-            has_metadata = doc.get('has_metadata', False)
             similarity_score = doc.get('similarity_score', 0) if search else 0
             
             # Semantic similarity indicator
-            match_indicator = ""
+            match = None
             if search and similarity_score > 0:
-                if similarity_score >= 70:
-                    color, label = "#22c55e", "High relevance"
-                elif similarity_score >= 50:
-                    color, label = "#3b82f6", "Moderate relevance"
-                elif similarity_score >= 30:
-                    color, label = "#f59e0b", "Low relevance"
-                else:
-                    color, label = "#8b5cf6", "Vector proximity"
-                
-                match_indicator = f"""
-                <div class="match-indicator" style="background: {color}; color: white; padding: 0.25rem 0.75rem; border-radius: 20px; font-size: 0.75rem; margin-bottom: 0.5rem;">
-                    🧠 {similarity_score:.1f}% • {label}
-                </div>
-                """
-            
-            cards_html += f"""
-            <div class="document-card">
-                {match_indicator}
-                <div class="doc-header">
-                    <h3 class="doc-title">{title}</h3>
-                    <span class="doc-category">{category}</span>
-                </div>
-                <p class="doc-preview">{doc_content[:200]}{"..." if len(doc_content) > 200 else ""}</p>
-                <div class="doc-stats">
-                    <span>📄 {word_count:,} words</span>
-                    {"<span>📋 Has metadata</span>" if has_metadata else ""}
-                </div>
-            </div>
-            """
-        
-        # Pagination controls
-        pagination_html = ""
-        if total_pages > 1:
-            prev_page = max(1, page - 1)
-            next_page = min(total_pages, page + 1)
+                color, label = RELEVANCE_STYLES[bisect_right(RELEVANCE_THRESHOLDS, similarity_score)]
+                match = {"score": similarity_score, "color": color, "label": label}
             
-            pagination_html = f"""
-            <div class="pagination">
-                {"" if page <= 1 else f'<a href="/documents?search={search}&page={prev_page}" class="page-btn">← Previous</a>'}
-                <span class="page-info">Page {page} of {total_pages}</span>
-                {"" if page >= total_pages else f'<a href="/documents?search={search}&page={next_page}" class="page-btn">Next →</a>'}
-            </div>
-            """
+            cards.append({
+                "title": doc.get('title', f'Document {doc_number}'),
+                "category": doc.get('category', 'Document'),
+                "preview": doc_content[:200] + ("..." if len(doc_content) > 200 else ""),
+                "word_count": doc['word_count'],
+                "has_metadata": doc.get('has_metadata', False),
+                "match": match
+            })
         
-        return HTMLResponse(f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Documents - ChromaDB Viewer</title>
-            <style>
-                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                body {{ 
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; 
-                    background: #f8fafc;
-                    min-height: 100vh;
-                    color: #1e293b;
-                }}
-                
-                .container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 2rem 1rem;
-                }}
-                
-                .header {{
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    margin-bottom: 2rem;
-                    flex-wrap: wrap;
-                    gap: 1rem;
-                }}
-                
-                .breadcrumb {{
-                    display: flex;
-                    align-items: center;
-                    gap: 0.5rem;
-                    color: #64748b;
-                }}
-                
-                .breadcrumb a {{
-                    color: #1e40af;
-                    text-decoration: none;
-                }}
-                
-                .doc-count {{
-                    color: #64748b;
-                    font-size: 0.875rem;
-                }}
-                
-                .search-section {{
-                    background: white;
-                    border-radius: 16px;
-                    padding: 1.5rem;
-                    margin-bottom: 2rem;
-                    border: 1px solid #e2e8f0;
-                }}
-                
-                .search-form {{
-                    display: flex;
-                    gap: 1rem;
-                    margin-bottom: 0.5rem;
-                }}
-                
-                .search-input {{
-                    flex: 1;
-                    padding: 0.75rem 1rem;
-                    border: 1px solid #d1d5db;
-                    border-radius: 8px;
-                    font-size: 1rem;
-                }}
-                
-                .search-input:focus {{
-                    outline: none;
-                    border-color: #1e40af;
-                    box-shadow: 0 0 0 3px rgba(30, 64, 175, 0.1);
-                }}
-                
-                .search-btn {{
-                    background: #1e40af;
-                    color: white;
-                    border: none;
-                    padding: 0.75rem 1.5rem;
-                    border-radius: 8px;
-                    font-weight: 500;
-                    cursor: pointer;
-                }}
-                
-                .clear-btn {{
-                    background: #f1f5f9;
-                    color: #64748b;
-                    border: none;
-                    padding: 0.75rem 1rem;
-                    border-radius: 8px;
-                    text-decoration: none;
-                    font-weight: 500;
-                }}
-                
-                .search-hint {{
-                    color: #64748b;
-                    font-size: 0.875rem;
-                    text-align: center;
-                }}
-                
-                .documents-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-                    gap: 1.5rem;
-                    margin-bottom: 3rem;
-                }}
-                
-                .document-card {{
-                    background: white;
-                    border-radius: 12px;
-                    padding: 1.5rem;
-                    border: 1px solid #e2e8f0;
-                    transition: all 0.2s;
-                }}
-                
-                .document-card:hover {{
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-                }}
-                
-                .doc-header {{
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: flex-start;
-                    margin-bottom: 1rem;
-                    gap: 1rem;
-                }}
-                
-                .doc-title {{
-                    font-size: 1.1rem;
-                    font-weight: 600;
-                    color: #1e293b;
-                    flex: 1;
-                    line-height: 1.4;
-                }}
-                
-                .doc-category {{
-                    background: #e0e7ff;
-                    color: #3730a3;
-                    padding: 0.25rem 0.5rem;
-                    border-radius: 6px;
-                    font-size: 0.75rem;
-                    font-weight: 500;
-                    white-space: nowrap;
-                }}
-                
-                .doc-preview {{
-                    color: #64748b;
-                    line-height: 1.6;
-                    margin-bottom: 1rem;
-                    font-size: 0.9rem;
-                }}
-                
-                .doc-stats {{
-                    display: flex;
-                    gap: 1rem;
-                    font-size: 0.75rem;
-                    color: #64748b;
-                }}
-                
-                .pagination {{
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                    gap: 2rem;
-                    margin-top: 3rem;
-                }}
-                
-                .page-btn {{
-                    background: #1e40af;
-                    color: white;
-                    padding: 0.75rem 1.5rem;
-                    border-radius: 8px;
-                    text-decoration: none;
-                    font-weight: 500;
-                }}
-                
-                .page-info {{
-                    color: #64748b;
-                    font-weight: 500;
-                }}
-                
-                @media (max-width: 640px) {{
-                    .search-form {{
-                        flex-direction: column;
-                    }}
-                    .documents-grid {{
-                        grid-template-columns: 1fr;
-                    }}
-                    .header {{
-                        flex-direction: column;
-                        align-items: flex-start;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="breadcrumb">
-                        <a href="/">🏠 Home</a>
-                        <span>→</span>
-                        <span>📄 Documents</span>
-                    </div>
-                    <div class="doc-count">
-                        {len(documents)} of {total_count} documents
-                    </div>
-                </div>
-                
-                <div class="search-section">
-                    <form class="search-form" method="get">
-                        <input type="text" name="search" class="search-input" 
-                               placeholder="🔍 Semantic Search - Ask questions or describe what you're looking for..." 
-                               value="{search}">
-                        <input type="hidden" name="page" value="1">
-                        <button type="submit" class="search-btn">🧠 Search</button>
-                        <a href="/documents" class="clear-btn">✕ Clear</a>
-                    </form>
-                    <div class="search-hint">
-                        {"🧠 Semantic search results for '" + search + "' (AI-powered meaning-based matching)" if search else "📚 Browse all documents or use semantic search to find specific content"}
-                    </div>
-                </div>
-                
-                <div class="documents-grid">
-                    {cards_html}
-                </div>
-                
-                {pagination_html}
-            </div>
-        </body>
-        </html>
-        """)
+        return ORJSONResponse(
+            {
+                "cards": cards,
+                "shown_count": len(cards),
+                "total_count": total_count,
+                "page": page,
+                "total_pages": total_pages
+            },
+            headers={"Cache-Control": "public, max-age=30", "Vary": "Accept-Encoding"} if backend_ok
+            else {"Cache-Control": "no-store"}
+        )
     except Exception as e:
-        return HTMLResponse(f"<h1>Error: {e}</h1>", status_code=500)
+        print(f"Error building documents page: {e}")
+        raise HTTPException(status_code=500, detail="Error loading documents")
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
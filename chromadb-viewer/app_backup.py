@@ -1,22 +1,122 @@
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse
-import requests
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from bisect import bisect_right
+from cachetools import TTLCache
+import httpx
+import jinja2
+import orjson
 import uvicorn
+from circuit_breaker import CircuitBreakerTransport
 from typing import Optional
+import asyncio
+import gzip
+import hashlib
+import html
 import os
+import re
+import zlib
 
-app = FastAPI(title="ChromaDB Document Viewer", version="2.0.0")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
 
 # Backend API URL - use container network
 BACKEND_URL = os.getenv("BACKEND_URL", "http://backend:8002")
 
-def get_documents_from_backend():
-    """Get all documents from backend API"""
+# Shared keep-alive connection pool to the backend; a container-local hop
+# should answer well within these timeouts
+backend_client = httpx.AsyncClient(
+    base_url=BACKEND_URL,
+    timeout=httpx.Timeout(3.0, connect=1.0),
+    transport=CircuitBreakerTransport(
+        reset_timeout=15,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await backend_client.aclose()
+
+app = FastAPI(
+    title="ChromaDB Document Viewer",
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+class _GZipExceptDocuments(GZipMiddleware):
+    """GZip responses, except document pages which compress their own bodies"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/document/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(_GZipExceptDocuments, minimum_size=500, compresslevel=5)
+
+class CachedStaticFiles(StaticFiles):
+    """Static files served with far-future caching; URLs are versioned by content hash"""
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+
+@lru_cache(maxsize=None)
+def static_url(filename: str) -> str:
+    """URL for a static asset with a content hash so deploys bust browser caches"""
+    with open(os.path.join(STATIC_DIR, filename), "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    return f"/static/{filename}?v={digest}"
+
+# Shared layout for every error and not-found page
+_ERROR_TEMPLATE = jinja2.Template("""<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ title }}</title>
+    <link rel="stylesheet" href="{{ stylesheet }}">
+</head>
+<body class="error-page">
+    <div class="error-card">
+        <div class="error-icon">{{ icon }}</div>
+        <h1>{{ title }}</h1>
+        <p class="error-message">{{ message }}</p>
+        {% for href, label in buttons %}
+        <a href="{{ href }}" class="btn{% if not loop.first %} btn-secondary{% endif %}">{{ label }}</a>
+        {% endfor %}
+    </div>
+</body>
+</html>
+""", autoescape=True)
+
+def _error_page(title: str, icon: str, message: str, buttons) -> HTMLResponse:
+    """Render an error page; buttons are (href, label) pairs, the first one highlighted"""
+    return HTMLResponse(_ERROR_TEMPLATE.render(
+        title=title, icon=icon, message=message, buttons=buttons, stylesheet=static_url("error.css")
+    ), headers={"Cache-Control": "no-store"})
+
+# Document list and stats, briefly cached so bursts of page loads share one fetch
+_LIST_CACHE = TTLCache(maxsize=8, ttl=30)
+
+# Document list fetches in flight by cache key, so concurrent misses for one page share a request
+_list_fetches = {}
+
+async def _fetch_documents(cache_key, params: dict):
+    """Fetch one page of documents from the backend and cache it"""
     try:
-        response = requests.get(f"{BACKEND_URL}/documents", timeout=10)
+        response = await backend_client.get("/documents", params=params)
         if response.status_code == 200:
-            data = response.json()
-            return data.get('documents', []), data.get('total', 0)
+            data = orjson.loads(response.content)
+            result = data.get('documents', []), data.get('total', 0)
+            _LIST_CACHE[cache_key] = result
+            return result
         else:
             print(f"Backend API error: {response.status_code} - {response.text}")
             return [], 0
@@ -24,14 +124,62 @@ def get_documents_from_backend():
         print(f"Error connecting to backend: {e}")
         return [], 0
 
-def semantic_search_backend(query: str, limit: int = 10):
-    """Perform semantic search using backend API"""
+async def get_documents_from_backend(page: int = 1, per_page: Optional[int] = None):
+    """Get one page of documents from backend API (all of them without per_page)"""
+    cache_key = ("documents", page, per_page)
+    cached = _LIST_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    params = {"page": page}
+    if per_page:
+        params["per_page"] = per_page
+    
+    task = _list_fetches.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_documents(cache_key, params))
+        _list_fetches[cache_key] = task
+        task.add_done_callback(lambda _: _list_fetches.pop(cache_key, None))
+    return await asyncio.shield(task)
+
+# Stand-in counters for pages rendered while the backend is unreachable
+_EMPTY_STATS = {"total": 0, "with_metadata": 0, "total_words": 0}
+
+async def get_stats_from_backend() -> Optional[dict]:
+    """Get aggregate document counters from backend API; None if the backend failed"""
+    cached = _LIST_CACHE.get("stats")
+    if cached is not None:
+        return cached
+    
     try:
-        response = requests.post(f"{BACKEND_URL}/search", 
-                                json={"query": query, "n_results": limit}, 
-                                timeout=10)
+        response = await backend_client.get("/stats")
         if response.status_code == 200:
-            data = response.json()
+            stats = orjson.loads(response.content)
+            _LIST_CACHE["stats"] = stats
+            return stats
+        else:
+            print(f"Backend API error: {response.status_code} - {response.text}")
+            return None
+    except Exception as e:
+        print(f"Error connecting to backend: {e}")
+        return None
+
+# Search results by normalized query; each miss costs the backend an embedding call
+_SEARCH_CACHE = TTLCache(maxsize=512, ttl=int(os.getenv("SEARCH_CACHE_TTL", "300")))
+
+async def semantic_search_backend(query: str, limit: int = 10):
+    """Perform semantic search using backend API; None if the backend failed"""
+    # Queries differing only in case or spacing embed the same, so share results
+    cache_key = (" ".join(query.casefold().split()), limit)
+    cached = _SEARCH_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    try:
+        # Search embeds the query with OpenAI first, so allow it longer than the default
+        response = await backend_client.post("/search", json={"query": query, "n_results": limit}, timeout=10)
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
             # Convert backend format to viewer format
             results = []
             for i, result in enumerate(data.get('results', [])):
@@ -45,1197 +193,577 @@ def semantic_search_backend(query: str, limit: int = 10):
                     "category": result.get('category', 'Search Result'),
                     "has_metadata": bool(result.get('metadata', {}))
                 })
-            return results, data.get('total_found', 0)
+            result = results, data.get('total_found', 0)
+            _SEARCH_CACHE[cache_key] = result
+            return result
         else:
             print(f"Search API error: {response.status_code} - {response.text}")
-            return [], 0
+            return None
     except Exception as e:
         print(f"Error in semantic search: {e}")
-        return [], 0
+        return None
 
 # Semantic search is now handled by the backend using OpenAI embeddings
 
+# Stored documents don't change between views, so keep recently viewed ones in memory
+_DOC_CACHE = TTLCache(maxsize=512, ttl=300)
+
+# Document fetches in flight, so concurrent misses for one document share a request
+_doc_fetches = {}
+
+async def _fetch_doc(doc_id: str) -> Optional[dict]:
+    """Fetch a document from the backend and cache it; None if the backend doesn't have it"""
+    response = await backend_client.get(f"/document/{doc_id}")
+    if response.status_code != 200:
+        return None
+    
+    doc_data = orjson.loads(response.content)
+    content = doc_data.get('content', 'No content available')
+    metadata = doc_data.get('metadata', {})
+    
+    # Pay for counting and escaping once per fetch rather than on every view; large
+    # documents are streamed and escaped chunk by chunk, so don't hold a second copy
+    if doc_data.get('word_count') is None:
+        doc_data['word_count'] = sum(1 for _ in _WORD_RE.finditer(content))
+    doc_data['char_count'] = len(content)
+    doc_data['has_metadata'] = bool(metadata)
+    if len(content) <= _STREAM_THRESHOLD:
+        doc_data['_content_esc'] = html.escape(content)
+    doc_data['_meta_html'] = _build_metadata_html(metadata)
+    
+    _DOC_CACHE[doc_id] = doc_data
+    return doc_data
+
+async def _get_doc(doc_id: str) -> Optional[dict]:
+    """Get a document, from cache when possible, coalescing concurrent misses"""
+    doc_data = _DOC_CACHE.get(doc_id)
+    if doc_data is not None:
+        return doc_data
+    
+    task = _doc_fetches.get(doc_id)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_doc(doc_id))
+        _doc_fetches[doc_id] = task
+        task.add_done_callback(lambda _: _doc_fetches.pop(doc_id, None))
+    return await asyncio.shield(task)
+
+# Rendered document pages as (body, gzipped body, etag); the page depends only on the stored document
+_PAGE_CACHE = TTLCache(maxsize=256, ttl=300)
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def _html_response(request: Request, body: bytes, etag: str, max_age: int) -> Response:
+    """Send a rendered page, or 304 when the browser already has this version"""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "")
+
+def _page_response(request: Request, body: bytes, gz: bytes, etag: str) -> Response:
+    """Send a cached document page, or 304 when the browser already has it"""
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300", "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if _accepts_gzip(request):
+        return Response(gz, media_type="text/html", headers={**headers, "Content-Encoding": "gzip"})
+    return HTMLResponse(body, headers=headers)
+
+def _gzip_stream(parts):
+    """Gzip a stream of text parts incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for part in parts:
+        data = compressor.compress(part.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
 @app.get("/health")
 async def health():
     """Health check endpoint"""
     return {"status": "healthy", "service": "chromadb-viewer"}
 
+# Home page, compiled once at import
+_HOME_TEMPLATE = jinja2.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>ChromaDB Document Viewer</title>
+    <link rel="stylesheet" href="{{ stylesheet }}">
+</head>
+<body>
+    <div class="header">
+        <div class="header-content">
+            <div class="logo">
+                📚 ChromaDB Viewer
+            </div>
+            <nav class="nav">
+                <a href="/documents" class="nav-btn">📄 Browse Documents</a>
+                <a href="/search" class="nav-btn">🔍 Search</a>
+                <a href="/upload" class="nav-btn">⬆️ Upload</a>
+            </nav>
+        </div>
+    </div>
+
+    <div class="main-content">
+        <div class="hero-section">
+            <h1 class="hero-title">Document Knowledge Base</h1>
+            <p class="hero-subtitle">
+                Explore, search, and manage your document collection with intelligent AI-powered features. 
+                Access your knowledge base with semantic search and smart document analysis.
+            </p>
+        </div>
+
+        <div class="stats-grid">
+            <div class="stat-card">
+                <span class="stat-number">{{ stats.total }}</span>
+                <div class="stat-label">Total Documents</div>
+            </div>
+            <div class="stat-card">
+                <span class="stat-number">{{ stats.with_metadata }}</span>
+                <div class="stat-label">With Metadata</div>
+            </div>
+            <div class="stat-card">
+                <span class="stat-number">{{ '{:,}'.format(stats.total_words) }}</span>
+                <div class="stat-label">Total Words</div>
+            </div>
+            <div class="stat-card">
+                <span class="stat-number">1536</span>
+                <div class="stat-label">Embedding Dimensions</div>
+            </div>
+            <div class="stat-card">
+                <span class="stat-number">✓</span>
+                <div class="stat-label">System Status</div>
+            </div>
+        </div>
+
+        <div class="features-grid">
+            <div class="feature-card">
+                <div class="feature-icon">🔍</div>
+                <div class="feature-title">Smart Search</div>
+                <div class="feature-desc">
+                    Use AI-powered semantic search with OpenAI's text-embedding-ada-002 model (1536 dimensions) to find relevant documents based on meaning, not just keywords.
+                </div>
+            </div>
+            <div class="feature-card">
+                <div class="feature-icon">📊</div>
+                <div class="feature-title">Document Analytics</div>
+                <div class="feature-desc">
+                    View detailed analytics and insights about your document collection and content patterns.
+                </div>
+            </div>
+            <div class="feature-card">
+                <div class="feature-icon">💬</div>
+                <div class="feature-title">AI Chat</div>
+                <div class="feature-desc">
+                    Ask questions about your documents and get intelligent responses powered by your knowledge base.
+                </div>
+            </div>
+        </div>
+
+        <div class="cta-section">
+            <a href="/documents" class="cta-btn">
+                📚 Explore Documents
+                <span>→</span>
+            </a>
+        </div>
+    </div>
+
+    <div class="footer">
+        <p>ChromaDB Document Viewer • Powered by AI • Built for Knowledge Management</p>
+    </div>
+</body>
+</html>
+""", autoescape=True)
+
 @app.get("/", response_class=HTMLResponse)
-async def home():
+async def home(request: Request):
     """Improved home page with overview and navigation"""
     # Get quick stats
-    documents, total_count = get_documents_from_backend()
+    stats = await get_stats_from_backend()
     
-    return HTMLResponse(f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>ChromaDB Document Viewer</title>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', system-ui, sans-serif; 
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh; 
-                color: #333;
-            }}
-            
-            .header {{
-                background: rgba(255, 255, 255, 0.95);
-                backdrop-filter: blur(10px);
-                padding: 1rem 2rem;
-                box-shadow: 0 2px 20px rgba(0,0,0,0.1);
-            }}
-            
-            .header-content {{
-                max-width: 1200px;
-                margin: 0 auto;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }}
-            
-            .logo {{
-                font-size: 1.5rem;
-                font-weight: 600;
-                color: #667eea;
-                display: flex;
-                align-items: center;
-                gap: 0.5rem;
-            }}
-            
-            .nav {{
-                display: flex;
-                gap: 1rem;
-            }}
-            
-            .nav-btn {{
-                background: #667eea;
-                color: white;
-                padding: 0.5rem 1rem;
-                border-radius: 6px;
-                text-decoration: none;
-                font-size: 0.9rem;
-                transition: all 0.3s ease;
-            }}
-            
-            .nav-btn:hover {{
-                background: #5a6fd8;
-                transform: translateY(-1px);
-            }}
-            
-            .main-content {{
-                max-width: 1200px;
-                margin: 0 auto;
-                padding: 3rem 2rem;
-            }}
-            
-            .hero-section {{
-                text-align: center;
-                margin-bottom: 4rem;
-            }}
-            
-            .hero-title {{
-                font-size: 3rem;
-                font-weight: 300;
-                color: white;
-                margin-bottom: 1rem;
-                text-shadow: 0 2px 10px rgba(0,0,0,0.3);
-            }}
-            
-            .hero-subtitle {{
-                font-size: 1.2rem;
-                color: rgba(255,255,255,0.9);
-                margin-bottom: 2rem;
-                max-width: 600px;
-                margin-left: auto;
-                margin-right: auto;
-                line-height: 1.6;
-            }}
-            
-            .stats-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 1.5rem;
-                margin: 3rem 0;
-            }}
-            
-            .stat-card {{
-                background: rgba(255, 255, 255, 0.95);
-                padding: 2rem;
-                border-radius: 12px;
-                text-align: center;
-                box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-                backdrop-filter: blur(10px);
-                transition: transform 0.3s ease;
-            }}
-            
-            .stat-card:hover {{
-                transform: translateY(-5px);
-            }}
-            
-            .stat-number {{
-                font-size: 2.5rem;
-                font-weight: 700;
-                color: #667eea;
-                display: block;
-                margin-bottom: 0.5rem;
-            }}
-            
-            .stat-label {{
-                color: #666;
-                font-size: 0.9rem;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-                font-weight: 500;
-            }}
-            
-            .features-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-                gap: 2rem;
-                margin: 3rem 0;
-            }}
-            
-            .feature-card {{
-                background: rgba(255, 255, 255, 0.95);
-                padding: 2rem;
-                border-radius: 12px;
-                box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-                backdrop-filter: blur(10px);
-                transition: transform 0.3s ease;
-            }}
-            
-            .feature-card:hover {{
-                transform: translateY(-5px);
-            }}
-            
-            .feature-icon {{
-                font-size: 2.5rem;
-                margin-bottom: 1rem;
-                display: block;
-            }}
-            
-            .feature-title {{
-                font-size: 1.2rem;
-                font-weight: 600;
-                color: #333;
-                margin-bottom: 0.5rem;
-            }}
-            
-            .feature-desc {{
-                color: #666;
-                line-height: 1.6;
-            }}
-            
-            .cta-section {{
-                text-align: center;
-                margin: 4rem 0;
-            }}
-            
-            .cta-btn {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 1rem 2rem;
-                border-radius: 8px;
-                text-decoration: none;
-                font-size: 1.1rem;
-                font-weight: 500;
-                display: inline-flex;
-                align-items: center;
-                gap: 0.5rem;
-                box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-                transition: all 0.3s ease;
-            }}
-            
-            .cta-btn:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 8px 25px rgba(102, 126, 234, 0.6);
-            }}
-            
-            .footer {{
-                background: rgba(255, 255, 255, 0.1);
-                color: rgba(255, 255, 255, 0.8);
-                text-align: center;
-                padding: 2rem;
-                margin-top: 4rem;
-                backdrop-filter: blur(10px);
-            }}
-            
-            @media (max-width: 768px) {{
-                .header-content {{
-                    flex-direction: column;
-                    gap: 1rem;
-                }}
-                .hero-title {{
-                    font-size: 2rem;
-                }}
-                .main-content {{
-                    padding: 2rem 1rem;
-                }}
-                .stats-grid {{
-                    grid-template-columns: repeat(2, 1fr);
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <div class="header-content">
-                <div class="logo">
-                    📚 ChromaDB Viewer
-                </div>
-                <nav class="nav">
-                    <a href="/documents" class="nav-btn">📄 Browse Documents</a>
-                    <a href="/search" class="nav-btn">🔍 Search</a>
-                    <a href="/upload" class="nav-btn">⬆️ Upload</a>
-                </nav>
+    # Zeros from an unreachable backend are rendered but never cached
+    if stats is None:
+        body = _HOME_TEMPLATE.render(stylesheet=static_url("home-classic.css"), stats=_EMPTY_STATS)
+        return HTMLResponse(body, headers={"Cache-Control": "no-store"})
+    
+    body = _HOME_TEMPLATE.render(stylesheet=static_url("home-classic.css"), stats=stats).encode()
+    return _html_response(request, body, _etag(body), max_age=30)
+
+# Relevance badge (color, label) for a similarity score, bucketed at 30/50/70
+RELEVANCE_THRESHOLDS = (30, 50, 70)
+RELEVANCE_STYLES = (
+    ("#8b5cf6", "Vector space proximity"),
+    ("#f59e0b", "Low semantic relevance"),
+    ("#3b82f6", "Moderate semantic relevance"),
+    ("#22c55e", "High semantic relevance")
+)
+
+# Document cards for one page of results, or an empty panel when a search misses
+_CARDS_TEMPLATE = jinja2.Template("""{% for card in cards %}
+<div class="document-card">
+    <div class="card-header">
+        <div class="doc-number">#{{ card.number }}</div>
+        <div class="doc-category">{{ card.category }}</div>
+    </div>
+    {% if card.match %}
+    <div class="match-indicator" style="background: {{ card.match.color }};">
+        🧠 {{ '%.1f' % card.match.score }}% semantic similarity • {{ card.match.label }}
+    </div>
+    {% endif %}
+    <div class="card-body">
+        <h3 class="doc-title">{{ card.title }}</h3>
+        <p class="doc-preview">{{ card.preview }}</p>
+        <div class="doc-stats">
+            <span class="word-count">📄 {{ '{:,}'.format(card.word_count) }} words</span>
+            {% if card.has_metadata %}<div class="metadata-badge">📋 Rich metadata</div>{% endif %}
+        </div>
+    </div>
+    <div class="card-footer">
+        <a href="/document/{{ card.id|urlencode }}" class="view-btn">View Document →</a>
+    </div>
+</div>
+{% else %}
+<div class="empty-results">
+    <div class="empty-icon">🔍</div>
+    <h3>No documents match '{{ search }}'</h3>
+    <p>Try describing what you're looking for in different words.</p>
+    <a href="/documents" class="view-btn">Show all documents →</a>
+</div>
+{% endfor %}""", autoescape=True)
+
+# Documents page shell, compiled once at import; the cards are rendered separately
+_DOCUMENTS_TEMPLATE = jinja2.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Documents - ChromaDB Viewer</title>
+    <link rel="stylesheet" href="{{ stylesheet }}">
+</head>
+<body>
+    <div class="header">
+        <div class="header-content">
+            <div class="breadcrumb">
+                <a href="/">🏠 Home</a>
+                <span>→</span>
+                <span>📄 Documents</span>
+            </div>
+            <div style="color: #666;">
+                {{ result_count }} of {{ total_count }} documents
             </div>
         </div>
-        
-        <div class="main-content">
-            <div class="hero-section">
-                <h1 class="hero-title">Document Knowledge Base</h1>
-                <p class="hero-subtitle">
-                    Explore, search, and manage your document collection with intelligent AI-powered features. 
-                    Access your knowledge base with semantic search and smart document analysis.
-                </p>
+    </div>
+
+    <div class="stats-section">
+        <div class="stats-container">
+            <div class="stat-item">
+                <div class="stat-number">{{ total_count }}</div>
+                <div class="stat-label">Total Documents</div>
             </div>
-            
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <span class="stat-number">{total_count}</span>
-                    <div class="stat-label">Total Documents</div>
-                </div>
-                <div class="stat-card">
-                    <span class="stat-number">{len([doc for doc in documents if doc.get('has_metadata', False)])}</span>
-                    <div class="stat-label">With Metadata</div>
-                </div>
-                <div class="stat-card">
-                    <span class="stat-number">{sum(doc.get('word_count', 0) for doc in documents):,}</span>
-                    <div class="stat-label">Total Words</div>
-                </div>
-                <div class="stat-card">
-                    <span class="stat-number">1536</span>
-                    <div class="stat-label">Embedding Dimensions</div>
-                </div>
-                <div class="stat-card">
-                    <span class="stat-number">✓</span>
-                    <div class="stat-label">System Status</div>
-                </div>
+            <div class="stat-item">
+                <div class="stat-number">{{ stats.with_metadata }}</div>
+                <div class="stat-label">With Metadata</div>
             </div>
-            
-            <div class="features-grid">
-                <div class="feature-card">
-                    <div class="feature-icon">🔍</div>
-                    <div class="feature-title">Smart Search</div>
-                    <div class="feature-desc">
-                        Use AI-powered semantic search with OpenAI's text-embedding-ada-002 model (1536 dimensions) to find relevant documents based on meaning, not just keywords.
-                    </div>
-                </div>
-                <div class="feature-card">
-                    <div class="feature-icon">📊</div>
-                    <div class="feature-title">Document Analytics</div>
-                    <div class="feature-desc">
-                        View detailed analytics and insights about your document collection and content patterns.
-                    </div>
-                </div>
-                <div class="feature-card">
-                    <div class="feature-icon">💬</div>
-                    <div class="feature-title">AI Chat</div>
-                    <div class="feature-desc">
-                        Ask questions about your documents and get intelligent responses powered by your knowledge base.
-                    </div>
-                </div>
+            <div class="stat-item">
+                <div class="stat-number">{{ '{:,}'.format(stats.total_words) }}</div>
+                <div class="stat-label">Total Words</div>
             </div>
-            
-            <div class="cta-section">
-                <a href="/documents" class="cta-btn">
-                    📚 Explore Documents
-                    <span>→</span>
-                </a>
+            <div class="stat-item">
+                <div class="stat-number">1536</div>
+                <div class="stat-label">Embedding Dimensions</div>
+            </div>
+            <div class="stat-item">
+                <div class="stat-number">text-embedding-ada-002</div>
+                <div class="stat-label">OpenAI Model</div>
             </div>
         </div>
-        
-        <div class="footer">
-            <p>ChromaDB Document Viewer • Powered by AI • Built for Knowledge Management</p>
+    </div>
+
+    <div class="search-section">
+        <form class="search-form" method="get">
+            <input type="text" name="search" class="search-input" 
+                   placeholder="🔍 Semantic Search - Ask questions or describe what you're looking for (AI-powered with 1536D embeddings)..." 
+                   value="{{ search }}">
+            <input type="hidden" name="page" value="1">
+            <button type="submit" class="search-btn">🔍 Search</button>
+            <a href="/documents" class="clear-btn">✕ Clear</a>
+        </form>
+        <div class="results-info">
+            {% if search %}🧠 Semantic search results for '{{ search }}' (AI-powered meaning-based matching){% else %}📚 All documents in your knowledge base{% endif %}
+        </div>
+    </div>
+
+    <div class="main-content">
+        <div class="documents-grid">
+            {{ cards_html|safe }}
         </div>
-    </body>
-    </html>
-    """)
+        {% if total_pages > 1 %}
+        <div class="pagination">
+            {% if page > 1 %}<a href="/documents?search={{ search|urlencode }}&amp;page={{ page - 1 }}" class="page-btn">← Previous</a>{% endif %}
+            <div class="page-info">Page {{ page }} of {{ total_pages }}</div>
+            {% if page < total_pages %}<a href="/documents?search={{ search|urlencode }}&amp;page={{ page + 1 }}" class="page-btn">Next →</a>{% endif %}
+        </div>
+        {% endif %}
+    </div>
+</body>
+</html>
+""", autoescape=True)
+
+# Rendered documents pages as (body, etag) by (search, page), kept as long as the data behind them
+_DOCS_PAGE_CACHE = TTLCache(maxsize=128, ttl=30)
 
 @app.get("/documents", response_class=HTMLResponse)
-async def documents_page(search: str = Query("", description="Search term"), page: int = Query(1, ge=1)):
+async def documents_page(request: Request, search: str = Query("", description="Search term"), page: int = Query(1, ge=1)):
     """Enhanced documents page with better UI"""
     try:
-        # Use semantic search if query provided, otherwise get all documents
+        cached = _DOCS_PAGE_CACHE.get((search, page))
+        if cached is not None:
+            return _html_response(request, *cached, max_age=30)
+        
+        per_page = 12
+        start_idx = (page - 1) * per_page
+        
+        # Semantic search returns a small ranked set that is paged here;
+        # browsing asks the backend for just the page being shown.
+        # The corpus-wide counters for the stats bar are fetched alongside.
         if search.strip():
-            documents, total_count = semantic_search_backend(search, limit=50)
-            if not documents:
-                documents, total_count = get_documents_from_backend()
+            results, stats = await asyncio.gather(
+                semantic_search_backend(search, limit=50),
+                get_stats_from_backend()
+            )
+            backend_failed = results is None
+            documents, total_count = results or ([], 0)
+            result_count = len(documents)
+            paginated_docs = documents[start_idx:start_idx + per_page]
         else:
-            documents, total_count = get_documents_from_backend()
+            (paginated_docs, total_count), stats = await asyncio.gather(
+                get_documents_from_backend(page, per_page),
+                get_stats_from_backend()
+            )
+            result_count = total_count
+            backend_failed = not result_count
         
-        if not documents:
-            return HTMLResponse("""
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Documents - No Connection</title>
-                <style>
-                    body {{ 
-                        font-family: system-ui; 
-                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                        min-height: 100vh; 
-                        display: flex; 
-                        align-items: center; 
-                        justify-content: center; 
-                        margin: 0; 
-                    }}
-                    .error-container {{
-                        background: rgba(255, 255, 255, 0.95);
-                        padding: 3rem;
-                        border-radius: 12px;
-                        text-align: center;
-                        max-width: 500px;
-                        box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-                    }}
-                    .error-icon {{ font-size: 4rem; margin-bottom: 1rem; }}
-                    .error-title {{ font-size: 1.5rem; font-weight: 600; margin-bottom: 1rem; color: #333; }}
-                    .error-desc {{ color: #666; margin-bottom: 2rem; line-height: 1.6; }}
-                    .btn {{ 
-                        background: #667eea; 
-                        color: white; 
-                        padding: 0.75rem 1.5rem; 
-                        border-radius: 6px; 
-                        text-decoration: none; 
-                        margin: 0 0.5rem; 
-                        display: inline-block;
-                        transition: all 0.3s ease;
-                    }}
-                    .btn:hover {{ background: #5a6fd8; transform: translateY(-1px); }}
-                </style>
-            </head>
-            <body>
-                <div class="error-container">
-                    <div class="error-icon">🔌</div>
-                    <div class="error-title">Backend Connection Failed</div>
-                    <div class="error-desc">
-                        Unable to connect to the document service. Please ensure all services are running and try again.
-                    </div>
-                    <a href="/documents" class="btn">🔄 Retry</a>
-                    <a href="/" class="btn">🏠 Home</a>
-                </div>
-            </body>
-            </html>
-            """)
+        # A search with no hits renders an empty results panel below; a failed
+        # search or an empty listing means the backend is unreachable
+        if backend_failed:
+            return _error_page(
+                "Backend Connection Failed", "🔌",
+                "Unable to connect to the document service. Please ensure all services are running and try again.",
+                [("/documents", "🔄 Retry"), ("/", "🏠 Home")]
+            )
         
-        # Documents are already filtered/ranked by backend semantic search
-        filtered_documents = documents
+        # Without stats the page still renders, with zeros, but isn't cached
+        degraded = stats is None
+        if degraded:
+            stats = _EMPTY_STATS
         
         # Pagination
-        per_page = 12
-        total_pages = max(1, (len(filtered_documents) + per_page - 1) // per_page)
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_docs = filtered_documents[start_idx:end_idx]
+        total_pages = max(1, (result_count + per_page - 1) // per_page)
         
         # Create document cards
-        cards_html = ""
+        cards = []
         for i, doc in enumerate(paginated_docs):
             doc_number = start_idx + i + 1
-            doc_id = doc.get('id', f'doc_{doc_number}')
             doc_content = doc.get('preview', '') or doc.get('content', '')
-            word_count = doc.get('word_count', len(doc_content.split()) if doc_content else 0)
-            title = doc.get('title', f'Document {doc_number}')
-            category = doc.get('category', 'Unknown')
-            has_metadata = doc.get('has_metadata', False)
             similarity_score = doc.get('similarity_score', 0) if search else 0
             
             # Semantic similarity indicator
-            match_indicator = ""
+            match = None
             if search and similarity_score > 0:
-                # Use more sophisticated semantic similarity display
-                if similarity_score >= 70:
-                    color, label = "#22c55e", "High semantic relevance"
-                elif similarity_score >= 50:
-                    color, label = "#3b82f6", "Moderate semantic relevance"
-                elif similarity_score >= 30:
-                    color, label = "#f59e0b", "Low semantic relevance"
-                else:
-                    color, label = "#8b5cf6", "Vector space proximity"
-                
-                match_indicator = f"""
-                <div class="match-indicator" style="background: {color};">
-                    🧠 {similarity_score:.1f}% semantic similarity • {label}
-                </div>
-                """
-            
-            # Metadata badge
-            metadata_badge = ""
-            if has_metadata:
-                metadata_badge = '<div class="metadata-badge">📋 Rich metadata</div>'
-            
-            cards_html += f"""
-            <div class="document-card">
-                <div class="card-header">
-                    <div class="doc-number">#{doc_number}</div>
-                    <div class="doc-category">{category}</div>
-                </div>
-                {match_indicator}
-                <div class="card-body">
-                    <h3 class="doc-title">{title}</h3>
-                    <p class="doc-preview">{doc_content[:150]}{"..." if len(doc_content) > 150 else ""}</p>
-                    <div class="doc-stats">
-                        <span class="word-count">📄 {word_count:,} words</span>
-                        {metadata_badge}
-                    </div>
-                </div>
-                <div class="card-footer">
-                    <a href="/document/{doc_id}" class="view-btn">View Document →</a>
-                </div>
-            </div>
-            """
+                color, label = RELEVANCE_STYLES[bisect_right(RELEVANCE_THRESHOLDS, similarity_score)]
+                match = {"score": similarity_score, "color": color, "label": label}
+            
+            cards.append({
+                "number": doc_number,
+                "id": doc.get('id', f'doc_{doc_number}'),
+                "title": doc.get('title', f'Document {doc_number}'),
+                "category": doc.get('category', 'Unknown'),
+                "preview": doc_content[:150] + ("..." if len(doc_content) > 150 else ""),
+                "word_count": doc['word_count'],
+                "has_metadata": doc.get('has_metadata', False),
+                "match": match
+            })
+        cards_html = _CARDS_TEMPLATE.render(cards=cards, search=search)
         
-        # Pagination controls
-        pagination_html = ""
-        if total_pages > 1:
-            prev_page = max(1, page - 1)
-            next_page = min(total_pages, page + 1)
-            
-            pagination_html = f"""
-            <div class="pagination">
-                {"" if page <= 1 else f'<a href="/documents?search={search}&page={prev_page}" class="page-btn">← Previous</a>'}
-                <div class="page-info">Page {page} of {total_pages}</div>
-                {"" if page >= total_pages else f'<a href="/documents?search={search}&page={next_page}" class="page-btn">Next →</a>'}
-            </div>
-            """
+        body = _DOCUMENTS_TEMPLATE.render(
+            stylesheet=static_url("documents-classic.css"),
+            search=search,
+            result_count=result_count,
+            total_count=total_count,
+            stats=stats,
+            cards_html=cards_html,
+            page=page,
+            total_pages=total_pages
+        ).encode()
+        if degraded:
+            return HTMLResponse(body, headers={"Cache-Control": "no-store"})
+        cached = _DOCS_PAGE_CACHE[(search, page)] = body, _etag(body)
+        return _html_response(request, *cached, max_age=30)
         
-        return HTMLResponse(f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Documents - ChromaDB Viewer</title>
-            <style>
-                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                body {{ 
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', system-ui, sans-serif; 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                }}
-                
-                .header {{
-                    background: rgba(255, 255, 255, 0.95);
-                    backdrop-filter: blur(10px);
-                    padding: 1rem 0;
-                    box-shadow: 0 2px 20px rgba(0,0,0,0.1);
-                }}
-                
-                .header-content {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 0 2rem;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }}
-                
-                .breadcrumb {{
-                    display: flex;
-                    align-items: center;
-                    gap: 0.5rem;
-                    color: #666;
-                }}
-                
-                .breadcrumb a {{
-                    color: #667eea;
-                    text-decoration: none;
-                }}
-                
-                .breadcrumb a:hover {{ text-decoration: underline; }}
-                
-                .search-section {{
-                    background: rgba(255, 255, 255, 0.95);
-                    margin: 2rem auto;
-                    max-width: 1200px;
-                    padding: 2rem;
-                    border-radius: 12px;
-                    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-                    backdrop-filter: blur(10px);
-                }}
-                
-                .search-form {{
-                    display: flex;
-                    gap: 1rem;
-                    align-items: center;
-                    max-width: 600px;
-                    margin: 0 auto;
-                }}
-                
-                .search-input {{
-                    flex: 1;
-                    padding: 1rem;
-                    border: 2px solid #e5e7eb;
-                    border-radius: 8px;
-                    font-size: 1rem;
-                    outline: none;
-                    transition: border-color 0.3s ease;
-                }}
-                
-                .search-input:focus {{ border-color: #667eea; }}
-                
-                .search-btn {{
-                    background: #667eea;
-                    color: white;
-                    border: none;
-                    padding: 1rem 2rem;
-                    border-radius: 8px;
-                    font-size: 1rem;
-                    cursor: pointer;
-                    transition: all 0.3s ease;
-                }}
-                
-                .search-btn:hover {{
-                    background: #5a6fd8;
-                    transform: translateY(-1px);
-                }}
-                
-                .clear-btn {{
-                    background: #ef4444;
-                    color: white;
-                    padding: 1rem 2rem;
-                    border-radius: 8px;
-                    text-decoration: none;
-                    transition: all 0.3s ease;
-                }}
-                
-                .clear-btn:hover {{
-                    background: #dc2626;
-                    transform: translateY(-1px);
-                }}
-                
-                .results-info {{
-                    text-align: center;
-                    margin-top: 1rem;
-                    color: #666;
-                }}
-                
-                .main-content {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 2rem;
-                }}
-                
-                .documents-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-                    gap: 2rem;
-                    margin: 2rem 0;
-                }}
-                
-                .document-card {{
-                    background: rgba(255, 255, 255, 0.95);
-                    border-radius: 12px;
-                    overflow: hidden;
-                    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-                    backdrop-filter: blur(10px);
-                    transition: all 0.3s ease;
-                }}
-                
-                .document-card:hover {{
-                    transform: translateY(-5px);
-                    box-shadow: 0 8px 30px rgba(0,0,0,0.15);
-                }}
-                
-                .card-header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 1rem;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }}
-                
-                .doc-number {{
-                    font-weight: 600;
-                    font-size: 1.1rem;
-                }}
-                
-                .doc-category {{
-                    background: rgba(255, 255, 255, 0.2);
-                    padding: 0.25rem 0.75rem;
-                    border-radius: 20px;
-                    font-size: 0.8rem;
-                }}
-                
-                .match-indicator {{
-                    color: white;
-                    padding: 0.5rem 1rem;
-                    font-size: 0.85rem;
-                    font-weight: 500;
-                }}
-                
-                .card-body {{
-                    padding: 1.5rem;
-                }}
-                
-                .doc-title {{
-                    font-size: 1.1rem;
-                    font-weight: 600;
-                    margin-bottom: 0.75rem;
-                    color: #333;
-                }}
-                
-                .doc-preview {{
-                    color: #666;
-                    line-height: 1.6;
-                    margin-bottom: 1rem;
-                    font-size: 0.9rem;
-                }}
-                
-                .doc-stats {{
-                    display: flex;
-                    flex-direction: column;
-                    gap: 0.5rem;
-                }}
-                
-                .word-count {{
-                    color: #666;
-                    font-size: 0.85rem;
-                }}
-                
-                .metadata-badge {{
-                    color: #667eea;
-                    font-size: 0.8rem;
-                    font-weight: 500;
-                }}
-                
-                .card-footer {{
-                    padding: 1rem 1.5rem;
-                    background: #f8fafc;
-                    border-top: 1px solid #e5e7eb;
-                }}
-                
-                .view-btn {{
-                    color: #667eea;
-                    text-decoration: none;
-                    font-weight: 500;
-                    transition: color 0.3s ease;
-                }}
-                
-                .view-btn:hover {{
-                    color: #5a6fd8;
-                }}
-                
-                .pagination {{
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                    gap: 2rem;
-                    margin: 3rem 0;
-                }}
-                
-                .page-btn {{
-                    background: rgba(255, 255, 255, 0.95);
-                    color: #667eea;
-                    padding: 1rem 2rem;
-                    border-radius: 8px;
-                    text-decoration: none;
-                    font-weight: 500;
-                    transition: all 0.3s ease;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                
-                .page-btn:hover {{
-                    background: white;
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 20px rgba(0,0,0,0.15);
-                }}
-                
-                .page-info {{
-                    color: white;
-                    font-weight: 500;
-                    background: rgba(255, 255, 255, 0.2);
-                    padding: 1rem 2rem;
-                    border-radius: 8px;
-                    backdrop-filter: blur(10px);
-                }}
-                
-                .stats-section {{
-                    padding: 2rem;
-                    margin: 0 auto;
-                    max-width: 1200px;
-                }}
-                
-                .stats-container {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 1.5rem;
-                }}
-                
-                .stat-item {{
-                    background: rgba(255, 255, 255, 0.95);
-                    backdrop-filter: blur(10px);
-                    padding: 2rem 1.5rem;
-                    border-radius: 12px;
-                    text-align: center;
-                    transition: all 0.3s ease;
-                    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-                }}
-                
-                .stat-item:hover {{
-                    transform: translateY(-5px);
-                    box-shadow: 0 8px 30px rgba(0,0,0,0.15);
-                }}
-                
-                .stat-number {{
-                    font-size: 2rem;
-                    font-weight: 700;
-                    color: #667eea;
-                    margin-bottom: 0.5rem;
-                    line-height: 1;
-                }}
-                
-                .stat-label {{
-                    font-size: 0.9rem;
-                    font-weight: 500;
-                    color: #666;
-                    text-transform: uppercase;
-                    letter-spacing: 0.5px;
-                }}
-                
-                @media (max-width: 768px) {{
-                    .search-form {{
-                        flex-direction: column;
-                        align-items: stretch;
-                    }}
-                    .documents-grid {{
-                        grid-template-columns: 1fr;
-                    }}
-                    .header-content {{
-                        flex-direction: column;
-                        gap: 1rem;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <div class="header-content">
-                    <div class="breadcrumb">
-                        <a href="/">🏠 Home</a>
-                        <span>→</span>
-                        <span>📄 Documents</span>
-                    </div>
-                    <div style="color: #666;">
-                        {len(filtered_documents)} of {total_count} documents
-                    </div>
-                </div>
+    except Exception as e:
+        return _error_page("Error Loading Documents", "⚠️", f"Error: {e}", [("/", "🏠 Back to Home")])
+
+# Whitespace-separated words, counted by iterating matches instead of splitting
+_WORD_RE = re.compile(r"\S+")
+
+# One row of the metadata tab; key and value are escaped before formatting
+_META_ROW = '<div class="metadata-item"><div class="metadata-key">{k}</div><div class="metadata-value">{v}</div></div>'
+_NO_METADATA = '<div class="no-metadata">No metadata available for this document.</div>'
+
+def _build_metadata_html(metadata: dict) -> str:
+    """Markup for the metadata tab, with keys and values escaped"""
+    return "".join(
+        _META_ROW.format(k=html.escape(key.replace('_', ' ').title()), v=html.escape(str(value)))
+        for key, value in metadata.items() if value
+    ) or _NO_METADATA
+
+# Documents larger than this are streamed rather than rendered and cached whole
+_STREAM_THRESHOLD = 256 * 1024
+
+def _chunked(text: str, size: int = 65536):
+    """Split text into fixed-size HTML-escaped pieces so it can be sent incrementally"""
+    return (html.escape(text[i:i + size]) for i in range(0, len(text), size))
+
+# Document view page, compiled once at import
+_DOC_TEMPLATE = jinja2.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Document View - ChromaDB Viewer</title>
+    <link rel="stylesheet" href="{{ stylesheet }}">
+</head>
+<body>
+    <div class="header">
+        <div class="header-content">
+            <div class="breadcrumb">
+                <a href="/">🏠 Home</a>
+                <span>→</span>
+                <a href="/documents">📄 Documents</a>
+                <span>→</span>
+                <span>📖 Document View</span>
             </div>
-            
-            <div class="stats-section">
-                <div class="stats-container">
-                    <div class="stat-item">
-                        <div class="stat-number">{total_count}</div>
-                        <div class="stat-label">Total Documents</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{len([doc for doc in documents if doc.get('has_metadata', False)])}</div>
-                        <div class="stat-label">With Metadata</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{sum(doc.get('word_count', 0) for doc in documents):,}</div>
-                        <div class="stat-label">Total Words</div>
+        </div>
+    </div>
+
+    <div class="main-content">
+        <div class="document-container">
+            <div class="document-header">
+                <div class="doc-title">📖 Document: {{ doc_id }}</div>
+                <div class="doc-info">
+                    <div class="info-item">
+                        <div class="info-label">Word Count</div>
+                        <div class="info-value">{{ word_count }}</div>
                     </div>
-                    <div class="stat-item">
-                        <div class="stat-number">1536</div>
-                        <div class="stat-label">Embedding Dimensions</div>
+                    <div class="info-item">
+                        <div class="info-label">Characters</div>
+                        <div class="info-value">{{ char_count }}</div>
                     </div>
-                    <div class="stat-item">
-                        <div class="stat-number">text-embedding-ada-002</div>
-                        <div class="stat-label">OpenAI Model</div>
+                    <div class="info-item">
+                        <div class="info-label">Metadata</div>
+                        <div class="info-value">{{ "Yes" if has_metadata else "No" }}</div>
                     </div>
                 </div>
             </div>
-            
-            <div class="search-section">
-                <form class="search-form" method="get">
-                    <input type="text" name="search" class="search-input" 
-                           placeholder="🔍 Semantic Search - Ask questions or describe what you're looking for (AI-powered with 1536D embeddings)..." 
-                           value="{search}">
-                    <input type="hidden" name="page" value="1">
-                    <button type="submit" class="search-btn">🔍 Search</button>
-                    <a href="/documents" class="clear-btn">✕ Clear</a>
-                </form>
-                <div class="results-info">
-                    {"🧠 Semantic search results for '" + search + "' (AI-powered meaning-based matching)" if search else "📚 All documents in your knowledge base"}
-                </div>
+
+            <div class="document-tabs">
+                <button class="tab active" onclick="showTab('content')">📄 Content</button>
+                <button class="tab" onclick="showTab('metadata')">📋 Metadata</button>
             </div>
-            
-            <div class="main-content">
-                <div class="documents-grid">
-                    {cards_html}
+
+            <div class="tab-content" id="content-tab">
+                <div class="document-content">{% for chunk in content_chunks %}{{ chunk|safe }}{% endfor %}</div>
+            </div>
+
+            <div class="tab-content" id="metadata-tab" style="display: none;">
+                <div class="metadata-grid">
+                    {{ metadata_html|safe }}
                 </div>
-                {pagination_html}
             </div>
-        </body>
-        </html>
-        """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-        <!DOCTYPE html>
-        <html>
-        <head><title>Error - Documents</title></head>
-        <body style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px; text-align: center; font-family: system-ui; min-height: 100vh; display: flex; align-items: center; justify-content: center;">
-            <div style="background: rgba(255,255,255,0.95); color: #333; padding: 3rem; border-radius: 12px; max-width: 500px;">
-                <div style="font-size: 3rem; margin-bottom: 1rem;">⚠️</div>
-                <h1>Error Loading Documents</h1>
-                <p style="margin: 1rem 0; color: #666;">Error: {str(e)}</p>
-                <a href="/" style="background: #667eea; color: white; padding: 1rem 2rem; text-decoration: none; border-radius: 6px; display: inline-block; margin-top: 1rem;">🏠 Back to Home</a>
+
+            <div class="actions">
+                <a href="/documents" class="btn">📄 Browse More Documents</a>
+                <a href="/" class="btn btn-secondary">🏠 Home</a>
             </div>
-        </body>
-        </html>
-        """)
+        </div>
+    </div>
+
+    <script>
+        function showTab(tabName) {
+            // Hide all tabs
+            document.getElementById('content-tab').style.display = 'none';
+            document.getElementById('metadata-tab').style.display = 'none';
+
+            // Remove active class from all tabs
+            document.querySelectorAll('.tab').forEach(tab => tab.classList.remove('active'));
+
+            // Show selected tab
+            document.getElementById(tabName + '-tab').style.display = 'block';
+
+            // Add active class to clicked tab
+            event.target.classList.add('active');
+        }
+    </script>
+</body>
+</html>
+""", autoescape=True)
 
 @app.get("/document/{doc_id}", response_class=HTMLResponse)
-async def view_document(doc_id: str):
+async def view_document(doc_id: str, request: Request):
     """Enhanced document view page"""
     try:
+        cached = _PAGE_CACHE.get(doc_id)
+        if cached is not None:
+            return _page_response(request, *cached)
+        
         # Get document from backend
-        response = requests.get(f"{BACKEND_URL}/document/{doc_id}", timeout=10)
+        doc_data = await _get_doc(doc_id)
         
-        if response.status_code != 200:
-            return HTMLResponse(f"""
-            <!DOCTYPE html>
-            <html>
-            <head><title>Document Not Found</title></head>
-            <body style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px; text-align: center; font-family: system-ui; min-height: 100vh; display: flex; align-items: center; justify-content: center;">
-                <div style="background: rgba(255,255,255,0.95); color: #333; padding: 3rem; border-radius: 12px; max-width: 500px;">
-                    <div style="font-size: 3rem; margin-bottom: 1rem;">📄</div>
-                    <h1>Document Not Found</h1>
-                    <p style="margin: 1rem 0; color: #666;">The requested document could not be found.</p>
-                    <a href="/documents" style="background: #667eea; color: white; padding: 1rem 2rem; text-decoration: none; border-radius: 6px; display: inline-block; margin: 0.5rem;">📄 Browse Documents</a>
-                    <a href="/" style="background: #6b7280; color: white; padding: 1rem 2rem; text-decoration: none; border-radius: 6px; display: inline-block; margin: 0.5rem;">🏠 Home</a>
-                </div>
-            </body>
-            </html>
-            """)
+        if doc_data is None:
+            _PAGE_CACHE.pop(doc_id, None)
+            return _error_page(
+                "Document Not Found", "📄", "The requested document could not be found.",
+                [("/documents", "📄 Browse Documents"), ("/", "🏠 Home")]
+            )
         
-        doc_data = response.json()
-        content = doc_data.get('content', 'No content available')
-        metadata = doc_data.get('metadata', {})
-        word_count = doc_data.get('word_count', len(content.split()) if content else 0)
+        # Metadata (and content below the streaming threshold) arrive already escaped from _fetch_doc
+        page_vars = dict(
+            stylesheet=static_url("doc.css"),
+            doc_id=doc_id,
+            word_count=f"{doc_data['word_count']:,}",
+            char_count=f"{doc_data['char_count']:,}",
+            has_metadata=doc_data['has_metadata'],
+            metadata_html=doc_data['_meta_html']
+        )
         
-        # Create metadata display
-        metadata_html = ""
-        if metadata:
-            for key, value in metadata.items():
-                if value:
-                    metadata_html += f"""
-                    <div class="metadata-item">
-                        <div class="metadata-key">{key.replace('_', ' ').title()}</div>
-                        <div class="metadata-value">{value}</div>
-                    </div>
-                    """
+        # Stream large documents so the page never sits in memory as one string
+        if doc_data['char_count'] > _STREAM_THRESHOLD:
+            parts = _DOC_TEMPLATE.generate(content_chunks=_chunked(doc_data['content']), **page_vars)
+            if _accepts_gzip(request):
+                return StreamingResponse(
+                    _gzip_stream(parts),
+                    media_type="text/html",
+                    headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+                )
+            return StreamingResponse((part.encode() for part in parts), media_type="text/html")
         
-        if not metadata_html:
-            metadata_html = '<div class="no-metadata">No metadata available for this document.</div>'
+        page = _DOC_TEMPLATE.render(content_chunks=(doc_data['_content_esc'],), **page_vars)
         
-        return HTMLResponse(f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Document View - ChromaDB Viewer</title>
-            <style>
-                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                body {{ 
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', system-ui, sans-serif; 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                    color: #333;
-                }}
-                
-                .header {{
-                    background: rgba(255, 255, 255, 0.95);
-                    backdrop-filter: blur(10px);
-                    padding: 1rem 0;
-                    box-shadow: 0 2px 20px rgba(0,0,0,0.1);
-                }}
-                
-                .header-content {{
-                    max-width: 1000px;
-                    margin: 0 auto;
-                    padding: 0 2rem;
-                }}
-                
-                .breadcrumb {{
-                    display: flex;
-                    align-items: center;
-                    gap: 0.5rem;
-                    color: #666;
-                }}
-                
-                .breadcrumb a {{
-                    color: #667eea;
-                    text-decoration: none;
-                }}
-                
-                .breadcrumb a:hover {{ text-decoration: underline; }}
-                
-                .main-content {{
-                    max-width: 1000px;
-                    margin: 2rem auto;
-                    padding: 0 2rem;
-                }}
-                
-                .document-container {{
-                    background: rgba(255, 255, 255, 0.95);
-                    border-radius: 12px;
-                    overflow: hidden;
-                    box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-                    backdrop-filter: blur(10px);
-                }}
-                
-                .document-header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 2rem;
-                }}
-                
-                .doc-title {{
-                    font-size: 1.5rem;
-                    font-weight: 600;
-                    margin-bottom: 1rem;
-                }}
-                
-                .doc-info {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-                    gap: 1rem;
-                    opacity: 0.9;
-                }}
-                
-                .info-item {{
-                    text-align: center;
-                }}
-                
-                .info-label {{
-                    font-size: 0.8rem;
-                    opacity: 0.8;
-                    margin-bottom: 0.25rem;
-                }}
-                
-                .info-value {{
-                    font-weight: 600;
-                }}
-                
-                .document-tabs {{
-                    background: #f8fafc;
-                    border-bottom: 1px solid #e5e7eb;
-                    display: flex;
-                }}
-                
-                .tab {{
-                    padding: 1rem 2rem;
-                    background: none;
-                    border: none;
-                    cursor: pointer;
-                    font-size: 1rem;
-                    color: #666;
-                    border-bottom: 3px solid transparent;
-                    transition: all 0.3s ease;
-                }}
-                
-                .tab.active {{
-                    color: #667eea;
-                    border-bottom-color: #667eea;
-                    background: white;
-                }}
-                
-                .tab-content {{
-                    padding: 2rem;
-                }}
-                
-                .document-content {{
-                    line-height: 1.8;
-                    font-size: 1.1rem;
-                    white-space: pre-wrap;
-                    color: #333;
-                }}
-                
-                .metadata-grid {{
-                    display: grid;
-                    gap: 1rem;
-                }}
-                
-                .metadata-item {{
-                    display: grid;
-                    grid-template-columns: 150px 1fr;
-                    gap: 1rem;
-                    padding: 0.75rem;
-                    background: #f8fafc;
-                    border-radius: 6px;
-                }}
-                
-                .metadata-key {{
-                    font-weight: 600;
-                    color: #374151;
-                }}
-                
-                .metadata-value {{
-                    color: #666;
-                }}
-                
-                .no-metadata {{
-                    text-align: center;
-                    color: #666;
-                    font-style: italic;
-                    padding: 2rem;
-                }}
-                
-                .actions {{
-                    margin-top: 2rem;
-                    text-align: center;
-                }}
-                
-                .btn {{
-                    background: #667eea;
-                    color: white;
-                    padding: 0.75rem 1.5rem;
-                    border-radius: 6px;
-                    text-decoration: none;
-                    margin: 0 0.5rem;
-                    display: inline-block;
-                    transition: all 0.3s ease;
-                }}
-                
-                .btn:hover {{
-                    background: #5a6fd8;
-                    transform: translateY(-1px);
-                }}
-                
-                .btn-secondary {{
-                    background: #6b7280;
-                }}
-                
-                .btn-secondary:hover {{
-                    background: #565e6b;
-                }}
-                
-                @media (max-width: 768px) {{
-                    .metadata-item {{
-                        grid-template-columns: 1fr;
-                        gap: 0.5rem;
-                    }}
-                    .document-tabs {{
-                        overflow-x: auto;
-                    }}
-                    .doc-info {{
-                        grid-template-columns: repeat(2, 1fr);
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <div class="header-content">
-                    <div class="breadcrumb">
-                        <a href="/">🏠 Home</a>
-                        <span>→</span>
-                        <a href="/documents">📄 Documents</a>
-                        <span>→</span>
-                        <span>📖 Document View</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="main-content">
-                <div class="document-container">
-                    <div class="document-header">
-                        <div class="doc-title">📖 Document: {doc_id}</div>
-                        <div class="doc-info">
-                            <div class="info-item">
-                                <div class="info-label">Word Count</div>
-                                <div class="info-value">{word_count:,}</div>
-                            </div>
-                            <div class="info-item">
-                                <div class="info-label">Characters</div>
-                                <div class="info-value">{len(content):,}</div>
-                            </div>
-                            <div class="info-item">
-                                <div class="info-label">Metadata</div>
-                                <div class="info-value">{"Yes" if metadata else "No"}</div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="document-tabs">
-                        <button class="tab active" onclick="showTab('content')">📄 Content</button>
-                        <button class="tab" onclick="showTab('metadata')">📋 Metadata</button>
-                    </div>
-                    
-                    <div class="tab-content" id="content-tab">
-                        <div class="document-content">{content}</div>
-                    </div>
-                    
-                    <div class="tab-content" id="metadata-tab" style="display: none;">
-                        <div class="metadata-grid">
-                            {metadata_html}
-                        </div>
-                    </div>
-                    
-                    <div class="actions">
-                        <a href="/documents" class="btn">📄 Browse More Documents</a>
-                        <a href="/" class="btn btn-secondary">🏠 Home</a>
-                    </div>
-                </div>
-            </div>
-            
-            <script>
-                function showTab(tabName) {{
-                    // Hide all tabs
-                    document.getElementById('content-tab').style.display = 'none';
-                    document.getElementById('metadata-tab').style.display = 'none';
-                    
-                    // Remove active class from all tabs
-                    document.querySelectorAll('.tab').forEach(tab => tab.classList.remove('active'));
-                    
-                    // Show selected tab
-                    document.getElementById(tabName + '-tab').style.display = 'block';
-                    
-                    // Add active class to clicked tab
-                    event.target.classList.add('active');
-                }}
-            </script>
-        </body>
-        </html>
-        """)
+        body = page.encode()
+        etag = _etag(body)
+        cached = _PAGE_CACHE[doc_id] = body, gzip.compress(body, 6), etag
+        return _page_response(request, *cached)
         
     except Exception as e:
-        return HTMLResponse(f"""
-        <!DOCTYPE html>
-        <html>
-        <head><title>Error - Document View</title></head>
-        <body style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px; text-align: center; font-family: system-ui; min-height: 100vh; display: flex; align-items: center; justify-content: center;">
-            <div style="background: rgba(255,255,255,0.95); color: #333; padding: 3rem; border-radius: 12px; max-width: 500px;">
-                <div style="font-size: 3rem; margin-bottom: 1rem;">⚠️</div>
-                <h1>Error Loading Document</h1>
-                <p style="margin: 1rem 0; color: #666;">Error: {str(e)}</p>
-                <a href="/documents" style="background: #667eea; color: white; padding: 1rem 2rem; text-decoration: none; border-radius: 6px; display: inline-block; margin: 0.5rem;">📄 Browse Documents</a>
-                <a href="/" style="background: #6b7280; color: white; padding: 1rem 2rem; text-decoration: none; border-radius: 6px; display: inline-block; margin: 0.5rem;">🏠 Home</a>
-            </div>
-        </body>
-        </html>
-        """)
+        return _error_page(
+            "Error Loading Document", "⚠️", f"Error: {e}",
+            [("/documents", "📄 Browse Documents"), ("/", "🏠 Home")]
+        )
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
@@ -1,37 +1,152 @@
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse
-import requests
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from cachetools import LRUCache, TTLCache
+import httpx
+import orjson
 import uvicorn
+from circuit_breaker import CircuitBreakerTransport
 from typing import Optional
+import asyncio
+import hashlib
 import os
+import random
 
-app = FastAPI(title="ChromaDB Document Viewer", version="2.0.0")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
 
 # Backend API URL - use container network
 BACKEND_URL = os.getenv("BACKEND_URL", "http://backend:8002")
 
-def get_documents_from_backend():
-    """Get all documents from backend API"""
+_backend_transport = CircuitBreakerTransport(
+    reset_timeout=30,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
+
+# Shared keep-alive connection pool to the backend
+backend_client = httpx.AsyncClient(
+    base_url=BACKEND_URL,
+    timeout=httpx.Timeout(2.0, connect=1.0),
+    transport=_backend_transport
+)
+
+RETRY_STATUSES = {502, 503, 504}
+
+async def backend_request(method: str, url: str, attempts: int = 3, **kwargs) -> httpx.Response:
+    """Call the backend, retrying transient failures with jittered exponential backoff"""
+    for attempt in range(attempts):
+        last = attempt == attempts - 1 or _backend_transport.is_open
+        try:
+            response = await backend_client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if last:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or last:
+                return response
+        # Full jitter so workers retrying the same outage don't retry in lockstep
+        await asyncio.sleep(random.uniform(0, min(1.0, 0.1 * 2 ** attempt)))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+    yield
+    await backend_client.aclose()
+
+app = FastAPI(
+    title="ChromaDB Document Viewer",
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+class CachedStaticFiles(StaticFiles):
+    """Static files served with far-future caching; URLs are versioned by content hash"""
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+
+@lru_cache(maxsize=None)
+def static_url(filename: str) -> str:
+    """URL for a static asset with a content hash so deploys bust browser caches"""
+    with open(os.path.join(STATIC_DIR, filename), "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    return f"/static/{filename}?v={digest}"
+
+# Page templates (shared with app.py), compiled once and kept in a bytecode cache
+templates = Environment(
+    loader=FileSystemLoader(os.path.join(BASE_DIR, "templates")),
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=FileSystemBytecodeCache()
+)
+templates.filters["thousands"] = lambda value: f"{value:,}"
+templates.globals["static_url"] = static_url
+
+# Rendered home pages keyed by ETag; the page only depends on the stats
+_home_pages = LRUCache(maxsize=8)
+
+# Stats change rarely, so repeated page loads share one fetch a minute
+_docs_cache = TTLCache(maxsize=1, ttl=60)
+_docs_lock = asyncio.Lock()
+
+# Last good stats, served while the backend is down or another request is fetching;
+# empty until the first successful fetch
+_last_known = {}
+_EMPTY_STATS = {"total": 0, "with_metadata": 0, "total_words": 0}
+
+async def get_stats_from_backend():
+    """Get aggregate document counters from backend API"""
+    cached = _docs_cache.get("stats")
+    if cached is not None:
+        return cached
+    
+    # Bulkhead: once there are real stats to fall back on, only one request per
+    # worker waits on the backend; the rest get the last good stats straight away
+    # instead of queueing behind a slow fetch. Before that, wait for the fetch.
+    if "stats" in _last_known:
+        try:
+            await asyncio.wait_for(_docs_lock.acquire(), timeout=0.05)
+        except asyncio.TimeoutError:
+            return _last_known["stats"]
+    else:
+        await _docs_lock.acquire()
     try:
-        response = requests.get(f"{BACKEND_URL}/documents", timeout=10)
+        # Another request may have filled the cache while this one waited
+        cached = _docs_cache.get("stats")
+        if cached is not None:
+            return cached
+        response = await backend_request("GET", "/stats")
         if response.status_code == 200:
-            data = response.json()
-            return data.get('documents', []), data.get('total', 0)
+            stats = orjson.loads(response.content)
+            _docs_cache["stats"] = _last_known["stats"] = stats
+            return stats
         else:
             print(f"Backend API error: {response.status_code} - {response.text}")
-            return [], 0
+            return _last_known.get("stats", _EMPTY_STATS)
     except Exception as e:
         print(f"Error connecting to backend: {e}")
-        return [], 0
+        return _last_known.get("stats", _EMPTY_STATS)
+    finally:
+        _docs_lock.release()
 
-def semantic_search_backend(query: str, limit: int = 10):
+async def semantic_search_backend(query: str, limit: int = 10):
     """Perform semantic search using backend API"""
     try:
-        response = requests.post(f"{BACKEND_URL}/search", 
-                                json={"query": query, "n_results": limit}, 
-                                timeout=10)
+        response = await backend_request(
+            "POST",
+            "/search",
+            content=orjson.dumps({"query": query, "n_results": limit}),
+            headers={"Content-Type": "application/json"}
+        )
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             # Convert backend format to viewer format
             results = []
             for i, result in enumerate(data.get('results', [])):
@@ -60,255 +175,73 @@ async def health():
     """Health check endpoint"""
     return {"status": "healthy", "service": "chromadb-viewer"}
 
+@app.post("/cache/invalidate")
+async def invalidate_cache():
+    """Drop cached backend data so the next request refetches it"""
+    # Best effort: each worker process has its own cache and this clears only the
+    # worker that receives the request; the others refetch when their TTL expires
+    _docs_cache.clear()
+    return {"status": "invalidated", "worker_pid": os.getpid()}
+
+def home_etag(total_count: int, total_words: int) -> str:
+    """The page is a pure function of the stats (and stylesheet version)"""
+    fingerprint = f"{total_count}:{total_words}:{static_url('home.css')}"
+    return '"' + hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest() + '"'
+
+def render_home(etag: str, total_count: int, total_words: int) -> str:
+    body = _home_pages.get(etag)
+    if body is None:
+        body = templates.get_template("home.html").render(total_count=total_count, total_words=total_words)
+        _home_pages[etag] = body
+    return body
+
+@lru_cache(maxsize=1)
+def home_head() -> str:
+    """Home page markup up to <body>, which doesn't depend on the stats"""
+    page = templates.get_template("home.html").render(total_count=0, total_words=0)
+    return page[:page.index("<body>")]
+
+async def stream_home():
+    """Send the head (and its stylesheet link) before waiting on the backend"""
+    head = home_head()
+    yield head
+    stats = await get_stats_from_backend()
+    total_count = stats.get('total', 0)
+    total_words = stats.get('total_words', 0)
+    yield render_home(home_etag(total_count, total_words), total_count, total_words)[len(head):]
+
 @app.get("/", response_class=HTMLResponse)
-async def home():
+async def home(request: Request):
     """Clean and focused ChromaDB viewer homepage"""
+    # On a stats cache miss, stream so the browser fetches CSS during the backend call
+    if "stats" not in _docs_cache:
+        return StreamingResponse(
+            stream_home(),
+            media_type="text/html",
+            headers={"Cache-Control": "no-cache", "X-Cache": "MISS"}
+        )
+    
     # Get essential stats only
-    documents, total_count = get_documents_from_backend()
+    stats = await get_stats_from_backend()
+    total_count = stats.get('total', 0)
+    total_words = stats.get('total_words', 0)
+    
+    etag = home_etag(total_count, total_words)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=30", "X-Cache": "HIT"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
     
-    return HTMLResponse(f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>ChromaDB Viewer</title>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; 
-                background: #f8fafc;
-                min-height: 100vh;
-                color: #1e293b;
-            }}
-            
-            .container {{
-                max-width: 900px;
-                margin: 0 auto;
-                padding: 2rem 1rem;
-            }}
-            
-            .header {{
-                text-align: center;
-                margin-bottom: 3rem;
-                padding: 2rem 0;
-            }}
-            
-            .title {{
-                font-size: 2.5rem;
-                font-weight: 800;
-                color: #1e40af;
-                margin-bottom: 0.5rem;
-            }}
-            
-            .subtitle {{
-                font-size: 1.1rem;
-                color: #64748b;
-                max-width: 500px;
-                margin: 0 auto;
-                line-height: 1.6;
-            }}
-            
-            .search-section {{
-                background: white;
-                border-radius: 16px;
-                padding: 2rem;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                margin-bottom: 3rem;
-                border: 1px solid #e2e8f0;
-            }}
-            
-            .search-form {{
-                display: flex;
-                gap: 1rem;
-                margin-bottom: 1rem;
-            }}
-            
-            .search-input {{
-                flex: 1;
-                padding: 0.875rem 1rem;
-                border: 1px solid #d1d5db;
-                border-radius: 8px;
-                font-size: 1rem;
-                transition: all 0.2s;
-            }}
-            
-            .search-input:focus {{
-                outline: none;
-                border-color: #1e40af;
-                box-shadow: 0 0 0 3px rgba(30, 64, 175, 0.1);
-            }}
-            
-            .search-btn {{
-                background: #1e40af;
-                color: white;
-                border: none;
-                padding: 0.875rem 1.5rem;
-                border-radius: 8px;
-                font-weight: 500;
-                cursor: pointer;
-                transition: all 0.2s;
-            }}
-            
-            .search-btn:hover {{
-                background: #1d4ed8;
-                transform: translateY(-1px);
-            }}
-            
-            .search-hint {{
-                color: #64748b;
-                font-size: 0.875rem;
-                text-align: center;
-            }}
-            
-            .stats {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
-                gap: 1rem;
-                margin-bottom: 2rem;
-            }}
-            
-            .stat {{
-                background: white;
-                border-radius: 12px;
-                padding: 1.5rem 1rem;
-                text-align: center;
-                border: 1px solid #e2e8f0;
-                transition: all 0.2s;
-            }}
-            
-            .stat:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-            }}
-            
-            .stat-number {{
-                font-size: 1.75rem;
-                font-weight: 700;
-                color: #1e40af;
-                display: block;
-                margin-bottom: 0.25rem;
-            }}
-            
-            .stat-label {{
-                font-size: 0.75rem;
-                color: #64748b;
-                text-transform: uppercase;
-                font-weight: 500;
-                letter-spacing: 0.05em;
-            }}
-            
-            .actions {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 1rem;
-            }}
-            
-            .action-btn {{
-                background: white;
-                border: 2px solid #e2e8f0;
-                border-radius: 12px;
-                padding: 1.5rem;
-                text-decoration: none;
-                color: inherit;
-                transition: all 0.2s;
-                display: flex;
-                align-items: center;
-                gap: 1rem;
-            }}
-            
-            .action-btn:hover {{
-                border-color: #1e40af;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-            }}
-            
-            .action-icon {{
-                font-size: 1.5rem;
-                flex-shrink: 0;
-            }}
-            
-            .action-text {{
-                flex: 1;
-            }}
-            
-            .action-title {{
-                font-weight: 600;
-                margin-bottom: 0.25rem;
-                color: #1e293b;
-            }}
-            
-            .action-desc {{
-                font-size: 0.875rem;
-                color: #64748b;
-            }}
-            
-            @media (max-width: 640px) {{
-                .search-form {{
-                    flex-direction: column;
-                }}
-                .stats {{
-                    grid-template-columns: repeat(2, 1fr);
-                }}
-                .actions {{
-                    grid-template-columns: 1fr;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1 class="title">ChromaDB Viewer</h1>
-                <p class="subtitle">AI-powered document search and exploration with semantic understanding</p>
-            </div>
-            
-            <div class="search-section">
-                <form class="search-form" action="/documents" method="get">
-                    <input type="text" name="search" class="search-input" 
-                           placeholder="Search documents with AI semantic understanding..." 
-                           autofocus>
-                    <button type="submit" class="search-btn">🔍 Search</button>
-                </form>
-                <p class="search-hint">Ask questions or describe what you're looking for - powered by OpenAI embeddings</p>
-            </div>
-            
-            <div class="stats">
-                <div class="stat">
-                    <span class="stat-number">{total_count}</span>
-                    <div class="stat-label">Documents</div>
-                </div>
-                <div class="stat">
-                    <span class="stat-number">{sum(doc.get('word_count', 0) for doc in documents):,}</span>
-                    <div class="stat-label">Words</div>
-                </div>
-                <div class="stat">
-                    <span class="stat-number">1536</span>
-                    <div class="stat-label">Dimensions</div>
-                </div>
-                <div class="stat">
-                    <span class="stat-number">AI</span>
-                    <div class="stat-label">Powered</div>
-                </div>
-            </div>
-            
-            <div class="actions">
-                <a href="/documents" class="action-btn">
-                    <div class="action-icon">📄</div>
-                    <div class="action-text">
-                        <div class="action-title">Browse All Documents</div>
-                        <div class="action-desc">View and explore your document collection</div>
-                    </div>
-                </a>
-                <a href="#" class="action-btn" onclick="const query = prompt('What are you looking for?'); if(query) {{ window.location.href = '/documents?search=' + encodeURIComponent(query); }} return false;">
-                    <div class="action-icon">🧠</div>
-                    <div class="action-text">
-                        <div class="action-title">Semantic Search</div>
-                        <div class="action-desc">Find documents by meaning, not just keywords</div>
-                    </div>
-                </a>
-            </div>
-        </div>
-    </body>
-    </html>
-    """)
\ No newline at end of file
+    return HTMLResponse(render_home(etag, total_count, total_words), headers=headers)
+
+if __name__ == "__main__":
+    # An import string so each worker process builds its own app and backend client;
+    # uvloop and httptools come with uvicorn[standard]
+    uvicorn.run(
+        "app_new:app",
+        host="0.0.0.0",
+        port=8003,
+        workers=int(os.getenv("UVICORN_WORKERS", "4")),
+        loop="uvloop",
+        http="httptools",
+        access_log=False
+    )
\ No newline at end of file
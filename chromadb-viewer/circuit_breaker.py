@@ -0,0 +1,39 @@
+import httpx
+import time
+
+# After fail_max consecutive connection errors or 5xx responses, backend calls
+# fail immediately for reset_timeout seconds rather than piling up behind timeouts
+class CircuitBreakerTransport(httpx.AsyncHTTPTransport):
+    """Connection pool that stops calling the backend while it is failing"""
+    def __init__(self, reset_timeout: float, fail_max: int = 5, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+    
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.fail_max and time.monotonic() - self.opened_at < self.reset_timeout
+    
+    async def handle_async_request(self, request):
+        if self.failures >= self.fail_max:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise httpx.ConnectError("Backend circuit open", request=request)
+            # Let this call probe the backend; others keep failing fast meanwhile
+            self.opened_at = time.monotonic()
+        try:
+            response = await super().handle_async_request(request)
+        except httpx.TransportError:
+            self._record_failure()
+            raise
+        if response.status_code >= 500:
+            self._record_failure()
+        else:
+            self.failures = 0
+        return response
+    
+    def _record_failure(self):
+        self.failures += 1
+        if self.failures >= self.fail_max:
+            self.opened_at = time.monotonic()
@@ -0,0 +1,80 @@
+// Renders the documents page from /api/documents so the server only sends JSON
+(function () {
+    const params = new URLSearchParams(window.location.search);
+    const search = params.get('search') || '';
+    const page = Math.max(1, parseInt(params.get('page'), 10) || 1);
+
+    const ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
+    function escapeHtml(value) {
+        return String(value).replace(/[&<>"']/g, (ch) => ESCAPES[ch]);
+    }
+
+    function pageUrl(number) {
+        return '/documents?' + new URLSearchParams({ search: search, page: number });
+    }
+
+    function renderCard(card) {
+        const match = card.match ? `
+            <div class="match-indicator" style="background: ${card.match.color}; color: white; padding: 0.25rem 0.75rem; border-radius: 20px; font-size: 0.75rem; margin-bottom: 0.5rem;">
+                🧠 ${card.match.score.toFixed(1)}% • ${escapeHtml(card.match.label)}
+            </div>` : '';
+        return `
+            <div class="document-card">
+                ${match}
+                <div class="doc-header">
+                    <h3 class="doc-title">${escapeHtml(card.title)}</h3>
+                    <span class="doc-category">${escapeHtml(card.category)}</span>
+                </div>
+                <p class="doc-preview">${escapeHtml(card.preview)}</p>
+                <div class="doc-stats">
+                    <span>📄 ${card.word_count.toLocaleString('en-US')} words</span>
+                    ${card.has_metadata ? '<span>📋 Has metadata</span>' : ''}
+                </div>
+            </div>`;
+    }
+
+    function renderPagination(data) {
+        if (data.total_pages <= 1) {
+            return '';
+        }
+        const prev = data.page > 1 ? `<a href="${pageUrl(data.page - 1)}" class="page-btn">← Previous</a>` : '';
+        const next = data.page < data.total_pages ? `<a href="${pageUrl(data.page + 1)}" class="page-btn">Next →</a>` : '';
+        return `
+            <div class="pagination">
+                ${prev}
+                <span class="page-info">Page ${data.page} of ${data.total_pages}</span>
+                ${next}
+            </div>`;
+    }
+
+    function renderEmpty() {
+        document.getElementById('documents-grid').outerHTML = `
+            <div class="empty-state">
+                <div class="empty-icon">📄</div>
+                <h2 class="empty-title">No Documents Found</h2>
+                <p class="empty-desc">Unable to connect to the backend or no documents available.</p>
+                <a href="/" class="page-btn">← Back to Home</a>
+            </div>`;
+    }
+
+    function render(data) {
+        if (!data.cards.length && !data.total_count) {
+            renderEmpty();
+            return;
+        }
+        document.getElementById('doc-count').textContent = `${data.shown_count} of ${data.total_count} documents`;
+        document.getElementById('documents-grid').innerHTML = data.cards.map(renderCard).join('');
+        document.getElementById('pagination').innerHTML = renderPagination(data);
+    }
+
+    document.getElementById('search-input').value = search;
+    document.getElementById('search-hint').textContent = search
+        ? `🧠 Semantic search results for '${search}' (AI-powered meaning-based matching)`
+        : '📚 Browse all documents or use semantic search to find specific content';
+
+    fetch('/api/documents?' + new URLSearchParams({ search: search, page: page }))
+        .then((response) => (response.ok ? response.json() : Promise.reject(response.status)))
+        .then(render)
+        .catch(renderEmpty);
+})();